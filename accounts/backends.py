@@ -0,0 +1,117 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+# Short-lived cache of the users that sessions resolve to, kept in the
+# default cache (CACHES) next to cached_db sessions.
+#
+# Why cache users at all?
+# - AuthenticationMiddleware looks the user up by primary key on every
+#   logged-in request, before the view runs. It is the same row, request
+#   after request.
+# - Entries expire after AUTH_USER_CACHE_TIMEOUT seconds and are deleted
+#   as soon as the user is saved (password change, last_login, profile
+#   edits), deleted or logged out (see accounts/signals.py).
+#
+# Why the shared cache and not a dict per process?
+# - The delete reaches every worker: after a password change, the old
+#   sessions fail their password hash check on their next request in any
+#   process, not up to AUTH_USER_CACHE_TIMEOUT later. That holds once
+#   CACHES is a shared backend (Redis/Memcached), as production needs for
+#   SESSION_STORE=cached_db anyway. With the default per-process
+#   LocMemCache, other workers keep their copy until it expires.
+# - One get_many() per request (the user and the generation below) still
+#   replaces a database query.
+#
+# Every get returns a fresh unpickled copy, so nothing one request sets on
+# request.user leaks into another.
+#
+# Examples:
+#     forget_user(user.pk)          # Drop one user
+#     forget_user()                 # Drop everyone (tests)
+
+DEFAULT_TIMEOUT = 30  # Seconds
+KEY_PREFIX = "auth-user"
+# Entries remember the generation they were stored under; forget_user()
+# bumps it, orphaning every entry at once.
+GENERATION_KEY = f"{KEY_PREFIX}:generation"
+
+
+def _timeout():
+    return getattr(settings, "AUTH_USER_CACHE_TIMEOUT", DEFAULT_TIMEOUT)
+
+
+def _key(pk):
+    return f"{KEY_PREFIX}:{pk}"
+
+
+def _valid_user(pk, found):
+    entry = found.get(_key(pk))
+    if entry is None:
+        return None
+    generation, user = entry
+    return user if generation == found.get(GENERATION_KEY) else None
+
+
+def cached_user(pk):
+    """A private copy of the cached user with this pk, or None."""
+    if not _timeout():
+        return None
+    return _valid_user(pk, cache.get_many([_key(pk), GENERATION_KEY]))
+
+
+async def acached_user(pk):
+    if not _timeout():
+        return None
+    return _valid_user(pk, await cache.aget_many([_key(pk), GENERATION_KEY]))
+
+
+def remember_user(user):
+    timeout = _timeout()
+    if timeout:
+        cache.set(_key(user.pk), (cache.get(GENERATION_KEY), user), timeout)
+
+
+async def aremember_user(user):
+    timeout = _timeout()
+    if timeout:
+        await cache.aset(_key(user.pk), (await cache.aget(GENERATION_KEY), user), timeout)
+
+
+def forget_user(pk=None, **kwargs):
+    """Drop one user (or every user) from the cache, in every process sharing it."""
+    if pk is not None:
+        cache.delete(_key(pk))
+        return
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        # Start from the clock: an evicted key must never come back as a
+        # generation old entries were stored under
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend whose get_user() (the per-request session lookup) is served
+    from the user cache above. authenticate() and permission checks are
+    unchanged.
+    """
+
+    def get_user(self, user_id):
+        user = cached_user(user_id)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                remember_user(user)
+        return user
+
+    async def aget_user(self, user_id):
+        user = await acached_user(user_id)
+        if user is None:
+            user = await super().aget_user(user_id)
+            if user is not None:
+                await aremember_user(user)
+        return user
@@ -1,3 +1,139 @@
-from django.test import TestCase
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 
-# Create your tests here.
+from config.query_budget import QueryBudgetMixin
+
+from .backends import KEY_PREFIX, cached_user, forget_user
+
+User = get_user_model()
+
+
+@override_settings(SESSION_ENGINE="django.contrib.sessions.backends.cached_db")
+class CachedAuthTests(TestCase):
+    """cached_db sessions plus accounts.backends.CachedModelBackend."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="alice", password="pass")
+
+    def setUp(self):
+        cache.clear()
+        forget_user()
+        self.client.login(username="alice", password="pass")
+        self.url = reverse("events:event_list")
+
+    def auth_queries(self):
+        """Queries against the session and user tables during one request."""
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, 200)
+        return [
+            query["sql"]
+            for query in queries
+            if 'FROM "django_session"' in query["sql"] or 'FROM "accounts_user"' in query["sql"]
+        ]
+
+    def test_warm_request_skips_session_and_user_lookups(self):
+        self.assertEqual(len(self.auth_queries()), 1)  # The user; the session came from the cache
+        self.assertEqual(self.auth_queries(), [])
+
+    def test_session_falls_back_to_database(self):
+        self.auth_queries()
+        cache.clear()
+        self.assertEqual(len(self.auth_queries()), 2)  # The session and the user, reloaded and recached
+        self.assertTrue(self.client.get(self.url).wsgi_request.user.is_authenticated)
+
+    def test_session_cookie_age_unchanged(self):
+        self.client.logout()
+        resp = self.client.post(reverse("accounts:login"), {"username": "alice", "password": "pass"})
+        self.assertEqual(resp.cookies[settings.SESSION_COOKIE_NAME]["max-age"], settings.SESSION_COOKIE_AGE)
+        self.assertEqual(self.client.session.get_expiry_age(), settings.SESSION_COOKIE_AGE)
+
+    def test_save_and_password_change_drop_cached_user(self):
+        self.auth_queries()
+        self.assertIsNotNone(cached_user(self.user.pk))
+
+        self.user.first_name = "Alice"
+        self.user.save()
+        self.assertIsNone(cached_user(self.user.pk))
+        self.assertEqual(self.client.get(self.url).wsgi_request.user.first_name, "Alice")
+
+        # Old sessions stop working on their next request, not when the cache expires
+        self.user.set_password("changed")
+        self.user.save()
+        self.assertFalse(self.client.get(self.url).wsgi_request.user.is_authenticated)
+
+    def test_logout_drops_cached_user(self):
+        self.auth_queries()
+        self.client.post(reverse("accounts:logout"))
+        self.assertIsNone(cached_user(self.user.pk))
+
+    def test_each_request_gets_its_own_copy(self):
+        self.auth_queries()
+        first, second = cached_user(self.user.pk), cached_user(self.user.pk)
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+
+    @override_settings(AUTH_USER_CACHE_TIMEOUT=0)
+    def test_timeout_zero_disables_cache(self):
+        self.auth_queries()
+        self.assertIsNone(cached_user(self.user.pk))
+
+    def test_cached_user_lives_in_shared_cache(self):
+        # Every worker reads (and a save deletes) the same entry
+        self.auth_queries()
+        self.assertIsNotNone(cache.get(f"{KEY_PREFIX}:{self.user.pk}"))
+        self.user.save()
+        self.assertIsNone(cache.get(f"{KEY_PREFIX}:{self.user.pk}"))
+
+    def test_forget_all_drops_every_user(self):
+        self.auth_queries()
+        forget_user()
+        self.assertIsNone(cached_user(self.user.pk))
+        self.assertEqual(len(self.auth_queries()), 1)
+        self.assertEqual(self.auth_queries(), [])
+
+    def test_session_from_plain_model_backend_still_logged_in(self):
+        # Sessions created before CachedModelBackend name ModelBackend
+        self.client.logout()
+        self.client.force_login(self.user, backend="django.contrib.auth.backends.ModelBackend")
+        self.assertEqual(self.client.session[BACKEND_SESSION_KEY], "django.contrib.auth.backends.ModelBackend")
+        self.assertEqual(self.client.get(self.url).wsgi_request.user, self.user)
+
+
+class AccountQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Every accounts route runs the same, budgeted number of queries with 1 or 500 rows."""
+
+    # (route name, method, budget, user, path, form data); see config/query_budget.py
+    ENDPOINTS = [
+        ("register", "get", 0, None, lambda t: reverse("accounts:register"), None),
+        (
+            "register",
+            "post",
+            11,
+            None,
+            lambda t: reverse("accounts:register"),
+            lambda t: {"username": "newcomer", "password1": "Budget-pass-123", "password2": "Budget-pass-123"},
+        ),
+        ("login", "get", 0, None, lambda t: reverse("accounts:login"), None),
+        (
+            "login",
+            "post",
+            9,
+            None,
+            lambda t: reverse("accounts:login"),
+            lambda t: {"username": "host", "password": "pass"},
+        ),
+        ("logout", "post", 4, "host", lambda t: reverse("accounts:logout"), None),
+    ]
+
+    def test_query_budgets(self):
+        self.assertEndpointBudgets(self.ENDPOINTS)
+
+    def test_every_route_has_a_budget(self):
+        self.assertRoutesBudgeted("accounts.urls", self.ENDPOINTS)
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.contrib.auth import login
 from django.shortcuts import redirect, render
 
@@ -23,7 +24,8 @@ def register(request):
         form = RegisterForm(request.POST)
         if form.is_valid():
             user = form.save()
-            login(request, user)
+            # Several backends are configured: name the one sessions should use
+            login(request, user, backend=settings.AUTHENTICATION_BACKENDS[0])
             return redirect("events:event_list")
     else:
         form = RegisterForm()
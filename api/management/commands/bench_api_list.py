@@ -0,0 +1,69 @@
+import time
+from collections import namedtuple
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.serializers import CompiledRows, EventSerializer
+from events.models import Event
+
+
+class Command(BaseCommand):
+    help = "Benchmark API event list serialization: EventSerializer vs compiled values_list() rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=[10_000, 100_000],
+            help="Event counts to serialize (default: 10000 100000)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Runs per measurement; the fastest is reported (default: 3)",
+        )
+
+    def handle(self, *args, **options):
+        # Unsaved, in-memory events: this measures serialization, not the database.
+        compiled = CompiledRows.compile(EventSerializer())
+        Row = namedtuple("Row", compiled.columns)
+        now = timezone.now()
+
+        self.stdout.write(f"{'events':>8} {'serializer rows/s':>18} {'compiled rows/s':>16} {'speedup':>8}")
+        for size in options["sizes"]:
+            events = [
+                Event(
+                    pk=i,
+                    title=f"Event {i}",
+                    description="",
+                    date_time=now + timedelta(hours=i),
+                    location=f"Room {i % 40}",
+                    price=Decimal(i % 7 * 5),
+                    category_id=i % 8 + 1,
+                    creator_id=i % 50 + 1,
+                )
+                for i in range(1, size + 1)
+            ]
+            rows = [Row(*(getattr(event, column) for column in compiled.columns)) for event in events]
+
+            slow_data = EventSerializer(events, many=True).data
+            if compiled.to_representation(rows) != list(slow_data):
+                self.stdout.write(self.style.ERROR("Compiled output differs from EventSerializer"))
+                return
+
+            slow = self.best_of(options["repeat"], lambda: EventSerializer(events, many=True).data)
+            fast = self.best_of(options["repeat"], lambda: compiled.to_representation(rows))
+            self.stdout.write(f"{size:>8} {size / slow:>18,.0f} {size / fast:>16,.0f} {slow / fast:>7.1f}x")
+
+    def best_of(self, repeat, func):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
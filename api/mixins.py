@@ -0,0 +1,177 @@
+import hashlib
+
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .serializers import CompiledRows
+
+
+class FastListMixin:
+    """Serve list pages from values_list() rows instead of model instances.
+
+    Same JSON, byte for byte, as the regular serializer path (see
+    api.serializers.CompiledRows), without building a model instance and
+    a field walk per row. Used automatically for every list request
+    whose serializer can be compiled; set fast_list = False to turn it
+    off for a view.
+    """
+
+    fast_list = True
+
+    def list(self, request, *args, **kwargs):
+        compiled = CompiledRows.compile(self.get_serializer()) if self.fast_list else None
+        if compiled is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        columns = list(compiled.columns)
+        ordering = getattr(self.paginator, "get_ordering", None)
+        if ordering is not None:
+            # The cursor reads its position from the row
+            sort_key = ordering(request, queryset, self)[0].lstrip("-")
+            if sort_key not in columns:
+                columns.append(sort_key)
+        rows = queryset.values_list(*columns, named=True)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(compiled.to_representation(page))
+        return Response(compiled.to_representation(rows))
+
+
+class ConditionalGetMixin:
+    """Strong ETag for list and retrieve, plus Last-Modified for retrieve.
+
+    Polling clients send If-None-Match / If-Modified-Since; when nothing
+    changed we answer 304 after one cheap fingerprint query, before the
+    page is loaded or anything is serialized.
+
+    Subclasses provide the fingerprints:
+        list_fingerprint(queryset) -> token
+        object_fingerprint()       -> (token, last_modified datetime),
+                                      or None if the object is missing
+
+    Lists send no Last-Modified: deleting a row removes it from the list
+    without raising any timestamp left in it, so If-Modified-Since would
+    answer 304 with the deleted row still in the client's copy. The list
+    token has to change on deletes instead (a row count does).
+
+    The ETag also covers the full path (filters, cursor, ?fields=), the
+    negotiated media type and the user, because all of them change the
+    body. Last-Modified has one-second resolution, so clients should
+    prefer the ETag, which Django checks first when both are sent.
+    """
+
+    def list(self, request, *args, **kwargs):
+        fingerprint = self.list_fingerprint(self.filter_queryset(self.get_queryset())), None
+        render = super().list
+        return self.conditional(request, fingerprint, lambda: render(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        fingerprint = self.object_fingerprint()
+        render = super().retrieve
+        if fingerprint is None:
+            return render(request, *args, **kwargs)  # Normal 404 path
+        return self.conditional(request, fingerprint, lambda: render(request, *args, **kwargs))
+
+    def conditional(self, request, fingerprint, render):
+        token, last_modified = fingerprint
+        user = request.user.pk if request.user.is_authenticated else ""
+        raw = "|".join([str(token), request.get_full_path(), request.accepted_media_type or "", str(user)])
+        etag = quote_etag(hashlib.sha256(raw.encode()).hexdigest()[:40])
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = render()
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            if timestamp is not None:
+                response["Last-Modified"] = http_date(timestamp)
+        return response
+
+
+class BulkCreateMixin:
+    """POST a JSON array to <list url>/bulk/ to create many objects at once.
+
+    One validation pass over the batch, with each FK model loaded by a
+    single in_bulk() query (see PrefetchedPrimaryKeyRelatedField), then
+    one bulk_create() inside a transaction. Invalid items don't stop
+    valid ones; the response reports every item by index:
+
+        {"created": 2, "skipped": 0, "failed": 1, "results": [
+            {"index": 0, "status": "created", "id": 41},
+            {"index": 1, "status": "error", "errors": {"event": [...]}},
+            ...]}
+
+    Status is 201 when nothing failed, 207 when some items failed, and
+    400 when all of them did.
+
+    Subclasses set:
+        bulk_serializer_class   defaults to serializer_class
+        bulk_prefetch           {field name: queryset} of FKs to batch-load
+    and implement perform_bulk_create(valid) -> {index: result dict}.
+    """
+
+    bulk_serializer_class = None
+    bulk_prefetch = {}
+    bulk_max_items = 1000
+    bulk_batch_size = 500
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError({"non_field_errors": ["Expected a list of items."]})
+        if len(items) > self.bulk_max_items:
+            raise ValidationError({"non_field_errors": [f"At most {self.bulk_max_items} items per request."]})
+
+        context = self.get_serializer_context()
+        context["prefetched"] = self.prefetch_related_rows(items)
+        serializer_class = self.bulk_serializer_class or self.get_serializer_class()
+
+        results = {}
+        valid = []
+        for index, item in enumerate(items):
+            serializer = serializer_class(data=item, context=context)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                results[index] = {"index": index, "status": "error", "errors": serializer.errors}
+
+        if valid:
+            with transaction.atomic():
+                results.update(self.perform_bulk_create(valid))
+
+        ordered = [results[index] for index in sorted(results)]
+        counts = {name: sum(1 for r in ordered if r["status"] == name) for name in ("created", "skipped", "error")}
+        if not counts["error"]:
+            code = status.HTTP_201_CREATED
+        elif counts["created"] or counts["skipped"]:
+            code = status.HTTP_207_MULTI_STATUS
+        else:
+            code = status.HTTP_400_BAD_REQUEST
+        body = {
+            "created": counts["created"],
+            "skipped": counts["skipped"],
+            "failed": counts["error"],
+            "results": ordered,
+        }
+        return Response(body, status=code)
+
+    def prefetch_related_rows(self, items):
+        """{field name: {pk: instance}} for every FK id mentioned in the batch"""
+        prefetched = {}
+        for name, queryset in self.bulk_prefetch.items():
+            ids = set()
+            for item in items:
+                value = item.get(name) if isinstance(item, dict) else None
+                if isinstance(value, (int, str)) and str(value).isdigit():
+                    ids.add(int(value))
+            prefetched[name] = queryset.in_bulk(ids) if ids else {}
+        return prefetched
@@ -0,0 +1,84 @@
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import replace_query_param
+
+from events.pagination import KeysetPaginator
+
+
+class RowKeysetPaginator(KeysetPaginator):
+    """KeysetPaginator that also pages values_list(named=True) rows (FastListMixin), which have id, not pk"""
+
+    def position(self, obj):
+        pk = getattr(obj, "pk", None)
+        return [getattr(obj, self.field), obj.id if pk is None else pk]
+
+
+class CursorPagination(pagination.CursorPagination):
+    """Default API pagination: opaque cursors instead of page numbers.
+
+    Pages come from events.pagination.KeysetPaginator: a cursor holds the
+    (sort value, pk) of the row at the page edge and the next page seeks
+    past both, so a deep page costs the same as the first and rows never
+    shift between pages while clients iterate. (DRF's own cursor seeks on
+    the sort value only and steps through ties with OFFSET, which made
+    deep pages of ?sort=price or ?sort=attendees O(N).)
+
+    ?cursor= is "n.<token>" (rows after) or "p.<token>" (rows before);
+    clients just follow the next/previous links.
+    """
+
+    ordering = "-pk"
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        sort = self.get_ordering(request, queryset, view)[0]
+        self.keyset = RowKeysetPaginator(
+            queryset, field=sort.lstrip("-"), descending=sort.startswith("-"), page_size=self.page_size
+        )
+
+        after = before = None
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            direction, _, token = cursor.partition(".")
+            if direction not in ("n", "p") or self.keyset.decode_cursor(token) is None:
+                raise NotFound(self.invalid_cursor_message)
+            after, before = (token, None) if direction == "n" else (None, token)
+
+        self.page = self.keyset.page(after=after, before=before)
+        self.has_next, self.has_previous = self.page.has_next, self.page.has_previous
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return list(self.page)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param, f"n.{self.page.next_cursor}")
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param, f"p.{self.page.previous_cursor}")
+
+
+class EventCursorPagination(CursorPagination):
+    """Pages events in the order chosen by ?sort=&dir= (events.filters.EventFilter)"""
+
+    def get_ordering(self, request, queryset, view):
+        spec = getattr(view, "filter_spec", None)
+        if spec is None:
+            return ("date_time", "pk")
+        return tuple(spec.ordering)
+
+
+class RSVPCursorPagination(CursorPagination):
+    """Newest RSVPs first, served by the (event|user, created_at, id) indexes"""
+
+    ordering = ("-created_at", "-pk")
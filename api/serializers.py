@@ -1,15 +1,201 @@
-from rest_framework import serializers
-from events.models import Event, RSVP
+import decimal
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
 from accounts.models import User
+from events.categories import get_category
+from events.models import RSVP, Category, Event
+
+
+class SparseFieldsMixin:
+    """Only include the fields named in context['fields'] (from ?fields=id,title)"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = self.context.get('fields')
+        if requested:
+            for name in set(self.fields) - set(requested):
+                self.fields.pop(name)
+
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """FK field that checks context['prefetched'][field_name] before querying.
+
+    Bulk endpoints load every referenced row with one in_bulk() per FK and
+    pass them in, so validating N items costs one query instead of N.
+    """
+    def to_internal_value(self, data):
+        prefetched = self.context.get('prefetched', {}).get(self.field_name)
+        if prefetched is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            obj = prefetched.get(int(data))
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if obj is None:
+            self.fail('does_not_exist', pk_value=data)
+        return obj
+
+class CategoryField(serializers.PrimaryKeyRelatedField):
+    """Category FK validated against the in-memory registry (no query per request)"""
+    def __init__(self, **kwargs):
+        kwargs.setdefault('queryset', Category.objects.all())
+        super().__init__(**kwargs)
 
-class EventSerializer(serializers.ModelSerializer):
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            category = get_category(int(data))
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if category is None:
+            self.fail('does_not_exist', pk_value=data)
+        return category
+
+class EventSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Converts Event model to/from JSON"""
+    serializer_related_field = PrefetchedPrimaryKeyRelatedField
+    category = CategoryField()
+
     class Meta:
         model = Event
-        fields = ['id', 'title', 'description', 'date_time', 'location', 'price', 'category', 'creator']
+        fields = ['id', 'title', 'description', 'date_time', 'location', 'price', 'capacity', 'category', 'creator']
+
+    def validate_capacity(self, value):
+        if value is not None and self.instance is not None and value < self.instance.attendee_count:
+            raise serializers.ValidationError(
+                f"{self.instance.attendee_count} people are already attending; capacity can't be lower."
+            )
+        return value
 
 class RSVPSerializer(serializers.ModelSerializer):
     """Converts RSVP model to/from JSON"""
+    serializer_related_field = PrefetchedPrimaryKeyRelatedField
+
     class Meta:
         model = RSVP
-        fields = ['id', 'event', 'user']
\ No newline at end of file
+        fields = ['id', 'event', 'user']
+
+class BulkRSVPSerializer(RSVPSerializer):
+    """RSVP validation for /api/rsvps/bulk/
+
+    Drops the per-item unique_together check (one query each); the bulk
+    endpoint checks existing RSVPs for the whole batch in one query and
+    inserts with ignore_conflicts.
+    """
+    class Meta(RSVPSerializer.Meta):
+        validators = []
+
+class CompiledRows:
+    """Serializes values_list() rows exactly like serializer.data would serialize instances.
+
+    Building a model instance per row and walking every serializer field
+    through get_attribute()/to_representation() costs more than the SQL
+    on large list pages. compile() inspects the serializer once and
+    returns the columns to SELECT plus one plain converter per field;
+    to_representation(rows) then only formats values.
+
+    compile() returns None if any field needs the real serializer
+    (custom to_representation, dotted source, formats not handled here),
+    and callers fall back to it.
+
+    Example:
+        compiled = CompiledRows.compile(EventSerializer(context=context))
+        rows = queryset.values_list(*compiled.columns, named=True)
+        data = compiled.to_representation(rows)
+    """
+    def __init__(self, names, columns, converters):
+        self.names = names
+        self.columns = columns
+        self.converters = converters
+
+    @classmethod
+    def compile(cls, serializer):
+        if not settings.USE_TZ:
+            return None
+        model = serializer.Meta.model
+        names, columns, converters = [], [], []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            source = field.source
+            if source == '*' or '.' in source:
+                return None
+            if isinstance(field, serializers.PrimaryKeyRelatedField):
+                # FK id straight from the row, no related object needed
+                if (
+                    field.pk_field is not None
+                    or type(field).to_representation is not serializers.PrimaryKeyRelatedField.to_representation
+                ):
+                    return None
+                column, convert = model._meta.get_field(source).attname, None
+            else:
+                column, convert = source, cls.converter(field)
+                if convert is False:
+                    return None
+            names.append(name)
+            columns.append(column)
+            converters.append(convert)
+        return cls(tuple(names), tuple(columns), tuple(converters))
+
+    @staticmethod
+    def converter(field):
+        """A value -> JSON-ready function for ``field``, None for identity, False if unsupported."""
+        kind = type(field)
+        if kind is serializers.BigIntegerField:
+            return str if getattr(field, 'coerce_to_string', api_settings.COERCE_BIGINT_TO_STRING) else None
+        if kind in (serializers.IntegerField, serializers.CharField):
+            # Ints and strings come back from the database ready to use
+            return None
+
+        if kind is serializers.DecimalField:
+            coerce = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+            if not coerce or field.localize or field.decimal_places is None:
+                return False
+            # Same quantize() as DecimalField, with its context built once
+            context = decimal.getcontext().copy()
+            if field.max_digits is not None:
+                context.prec = field.max_digits
+            exponent = decimal.Decimal('.1') ** field.decimal_places
+            rounding = field.rounding
+            normalize = field.normalize_output
+
+            def convert(value):
+                if not isinstance(value, decimal.Decimal):
+                    value = decimal.Decimal(str(value).strip())
+                value = value.quantize(exponent, rounding=rounding, context=context)
+                if normalize:
+                    value = value.normalize()
+                return f'{value:f}'
+            return convert
+
+        if kind is serializers.DateTimeField:
+            output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+            if output_format is None or output_format.lower() != ISO_8601:
+                return False
+            zone = getattr(field, 'timezone', None) or timezone.get_current_timezone()
+
+            def convert(value):
+                value = value.astimezone(zone).isoformat()
+                if value.endswith('+00:00'):
+                    value = value[:-6] + 'Z'
+                return value
+            return convert
+
+        return False
+
+    def to_representation(self, rows):
+        names = self.names
+        converters = self.converters
+        data = []
+        for row in rows:
+            item = {}
+            # Rows may carry trailing columns (e.g. a cursor sort key); zip stops at names
+            for name, convert, value in zip(names, converters, row):
+                item[name] = value if convert is None or value is None else convert(value)
+            data.append(item)
+        return data
@@ -1,17 +1,29 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.http import http_date
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from config.query_budget import QueryBudgetMixin
+from events.categories import clear_categories
 from events.models import Event, Category, RSVP
+from .serializers import CompiledRows, EventSerializer
+from .views import EventViewSet
 
 User = get_user_model()
 
 class EventAPITests(APITestCase):
 
     def setUp(self):
+        clear_categories()
         # create two users and a category/event
         self.user = User.objects.create_user(username="alice", password="pass")
         self.other = User.objects.create_user(username="bob", password="pass")
@@ -77,6 +89,270 @@ class EventAPITests(APITestCase):
         self.event.refresh_from_db()
         self.assertEqual(self.event.title, "Party!,")
 
+    def test_list_filters_and_sorts_in_database(self):
+        Event.objects.create(
+            title="Gala",
+            description="fancy",
+            date_time=timezone.now(),
+            location="hall",
+            price=50,
+            category=self.category,
+            creator=self.other,
+        )
+        resp = self.client.get(self.list_url, {"price_min": "10", "sort": "price", "dir": "desc"})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual([e["title"] for e in resp.json()["results"]], ["Gala"])
+
+        resp = self.client.get(self.list_url, {"free_only": "1"})
+        self.assertEqual([e["title"] for e in resp.json()["results"]], ["Party"])
+
+    def test_list_my_events_requires_login(self):
+        # Anonymous: auth-only filters are skipped, like the HTML list
+        resp = self.client.get(self.list_url, {"my_events": "1"})
+        self.assertEqual(len(resp.json()["results"]), 1)
+
+        self.client.force_authenticate(user=self.other) # type: ignore
+        resp = self.client.get(self.list_url, {"my_events": "1"})
+        self.assertEqual(resp.json()["results"], [])
+
+    def test_list_rejects_invalid_filters(self):
+        resp = self.client.get(self.list_url, {"date_from": "2026-02-30", "sort": "title"})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("date_from", resp.json())
+        self.assertIn("sort", resp.json())
+
+    def test_create_validates_category_without_query(self):
+        self.client.force_authenticate(user=self.user) # type: ignore
+        payload = {
+            "title": "New",
+            "description": "More",
+            "date_time": timezone.now(),
+            "location": "There",
+            "price": 5,
+            "category": 999999,
+            "creator": self.user.pk,
+        }
+        resp = self.client.post(self.list_url, payload, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("category", resp.json())
+
+        payload["category"] = self.category.pk
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.post(self.list_url, payload, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertFalse([q for q in queries if "events_category" in q["sql"]])
+
+    def test_list_is_cursor_paginated(self):
+        Event.objects.bulk_create(
+            Event(
+                title=f"Bulk {i}",
+                description="fun",
+                date_time=timezone.now(),
+                location="here",
+                price=i,
+                category=self.category,
+                creator=self.user,
+            )
+            for i in range(1, 8)
+        )
+        seen = []
+        url = self.list_url + "?sort=price&dir=desc&page_size=3"
+        while url:
+            # ETag fingerprint + the page itself
+            with self.assertNumQueries(2):
+                data = self.client.get(url).json()
+            self.assertLessEqual(len(data["results"]), 3)
+            seen.extend(e["id"] for e in data["results"])
+            url = data["next"]
+        expected = list(Event.objects.order_by("-price", "-pk").values_list("pk", flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_tied_sort_pages_by_keyset_without_offset(self):
+        # 300 free events: every row ties on price, only the pk orders them
+        Event.objects.bulk_create(
+            Event(
+                title=f"Free {i}",
+                description="fun",
+                date_time=timezone.now(),
+                location="here",
+                price=0,
+                category=self.category,
+                creator=self.user,
+            )
+            for i in range(300)
+        )
+        seen, pages = [], []
+        url = self.list_url + "?sort=price"
+        with CaptureQueriesContext(connection) as queries:
+            while url:
+                data = self.client.get(url).json()
+                seen.extend(e["id"] for e in data["results"])
+                pages.append(data)
+                url = data["next"]
+        self.assertEqual(seen, list(Event.objects.order_by("price", "pk").values_list("pk", flat=True)))
+        self.assertEqual(len(pages), 7)
+        self.assertFalse([q["sql"] for q in queries if "OFFSET" in q["sql"]])
+
+        # Previous from the last page gives the page before it back
+        data = self.client.get(pages[-1]["previous"]).json()
+        self.assertEqual(data["results"], pages[-2]["results"])
+
+        resp = self.client.get(self.list_url, {"sort": "price", "cursor": "n.bogus"})
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_sparse_fields_limit_output_and_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.get(self.list_url, {"fields": "id,title,date_time"})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(resp.json()["results"][0]), {"id", "title", "date_time"})
+        sql = queries[0]["sql"]
+        self.assertNotIn('"description"', sql)
+        self.assertNotIn("JOIN", sql)
+
+        resp = self.client.get(self.detail_url, {"fields": "title,category"})
+        self.assertEqual(resp.json(), {"title": "Party", "category": self.category.pk})
+
+    def test_sparse_fields_rejects_unknown_names(self):
+        resp = self.client.get(self.list_url, {"fields": "id,password"})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("fields", resp.json())
+
+    def test_detail_is_one_query(self):
+        # ETag fingerprint + the single-query loader
+        with self.assertNumQueries(2):
+            resp = self.client.get(self.detail_url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()["id"], self.event.pk)
+
+    def test_list_conditional_get(self):
+        resp = self.client.get(self.list_url, {"sort": "price"})
+        etag = resp["ETag"]
+        self.assertTrue(etag.startswith('"'))
+        # A delete leaves MAX(updated_at) alone, so lists send no Last-Modified
+        self.assertNotIn("Last-Modified", resp)
+
+        # Unchanged: 304 after only the fingerprint query
+        with self.assertNumQueries(1):
+            resp = self.client.get(self.list_url, {"sort": "price"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(resp.content, b"")
+
+        # Different query string -> different ETag
+        resp = self.client.get(self.list_url, {"sort": "location"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        # An RSVP changes the event, so the list ETag changes too
+        RSVP.objects.create(user=self.other, event=self.event)
+        resp = self.client.get(self.list_url, {"sort": "price"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(resp["ETag"], etag)
+
+    def test_list_conditional_get_after_delete(self):
+        older = Event.objects.create(
+            title="Older",
+            description="Desc",
+            date_time=self.event.date_time,
+            location="Loc",
+            category=self.category,
+            creator=self.user,
+        )
+        Event.objects.filter(pk=older.pk).update(updated_at=self.event.updated_at - timedelta(days=1))
+        resp = self.client.get(self.list_url)
+        etag, seen_at = resp["ETag"], http_date()
+
+        # Deleting the older event leaves MAX(updated_at) where it was
+        older.delete()
+        resp = self.client.get(self.list_url, HTTP_IF_MODIFIED_SINCE=seen_at)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertNotIn(older.title, [event["title"] for event in resp.json()["results"]])
+        resp = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+    def test_detail_conditional_get(self):
+        resp = self.client.get(self.detail_url)
+        etag, last_modified = resp["ETag"], resp["Last-Modified"]
+
+        with self.assertNumQueries(1):
+            resp = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        resp = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.event.title = "Changed"
+        self.event.save()
+        resp = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()["title"], "Changed")
+
+        resp = self.client.get(reverse("event-detail", args=[999999]), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_bulk_create_events_reports_each_item(self):
+        self.client.force_authenticate(user=self.user) # type: ignore
+        item = {
+            "title": "Bulk",
+            "description": "d",
+            "date_time": timezone.now(),
+            "location": "l",
+            "price": 1,
+            "category": self.category.pk,
+            "creator": self.user.pk,
+        }
+        payload = [item] * 20 + [{**item, "category": 999999}]
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.post(reverse("event-bulk"), payload, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_207_MULTI_STATUS)
+        body = resp.json()
+        self.assertEqual((body["created"], body["failed"]), (20, 1))
+        self.assertEqual(body["results"][20]["status"], "error")
+        self.assertIn("category", body["results"][20]["errors"])
+        self.assertEqual(Event.objects.filter(title="Bulk").count(), 20)
+        # Users in one query, one INSERT, plus savepoint bookkeeping: not 21 of each
+        self.assertLess(len(queries), 10)
+
+    def test_bulk_create_rejects_non_list(self):
+        self.client.force_authenticate(user=self.user) # type: ignore
+        resp = self.client.post(reverse("event-bulk"), {"title": "X"}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_fast_list_matches_serializer_output(self):
+        start = timezone.now().replace(microsecond=123456)
+        for i in range(7):
+            Event.objects.create(
+                title=f"Event {i}",
+                description="",
+                date_time=start + timedelta(days=i, seconds=i),
+                location=f"Room {i % 3}",
+                price=Decimal(i * 5) / 4,
+                category=self.category,
+                creator=self.other,
+            )
+        queries = [
+            {},
+            {"page_size": 3},
+            {"sort": "price", "dir": "desc", "page_size": 2},
+            {"sort": "attendees", "fields": "id,price"},
+            {"fields": "title,date_time,creator"},
+        ]
+        self.assertIsNotNone(CompiledRows.compile(EventSerializer()))
+        self.client.force_authenticate(user=self.user) # type: ignore
+        for tz in ("UTC", "America/Chicago"):
+            with timezone.override(tz):
+                for params in queries:
+                    fast = self.client.get(self.list_url, params)
+                    with mock.patch.object(EventViewSet, "fast_list", False):
+                        slow = self.client.get(self.list_url, params)
+                    self.assertEqual(fast.status_code, 200)
+                    self.assertEqual(fast.content, slow.content, (tz, params))
+                    # Following the cursor gives the same next page too
+                    next_url = fast.json()["next"]
+                    if next_url:
+                        fast_next = self.client.get(next_url)
+                        with mock.patch.object(EventViewSet, "fast_list", False):
+                            slow_next = self.client.get(next_url)
+                        self.assertEqual(fast_next.content, slow_next.content)
+
     def test_non_creator_cannot_update_event(self):
         # non-owner should still be forbidden
         self.client.force_authenticate(user=self.other) # type: ignore
@@ -118,3 +394,225 @@ class RSVPACTests(APITestCase):
         self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
         self.assertEqual(RSVP.objects.filter(event=self.event, user=self.user).count(), 1)
 
+    def test_rsvp_create_and_delete_keep_attendee_count(self):
+        self.client.force_authenticate(user=self.user) # type: ignore
+        resp = self.client.post(self.rsvp_list, {
+            "event": self.event.pk,
+            "user": self.user.pk,
+        }, format="json")
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendee_count, 1)
+
+        resp = self.client.delete(reverse("rsvp-detail", args=[resp.json()["id"]]))
+        self.assertEqual(resp.status_code, status.HTTP_204_NO_CONTENT)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendee_count, 0)
+
+    def test_rsvp_respects_capacity(self):
+        self.event.capacity = 1
+        self.event.save()
+        other = User.objects.create_user(username="carol", password="pass")
+        RSVP.objects.create(user=other, event=self.event)
+
+        self.client.force_authenticate(user=self.user) # type: ignore
+        resp = self.client.post(self.rsvp_list, {"event": self.event.pk, "user": self.user.pk}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("full", resp.json()["event"][0])
+
+        resp = self.client.post(reverse("rsvp-bulk"), [{"event": self.event.pk, "user": self.user.pk}], format="json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendee_count, 1)
+
+    def test_rsvp_list_and_detail_conditional_get(self):
+        rsvp = RSVP.objects.create(user=self.user, event=self.event)
+        detail_url = reverse("rsvp-detail", args=[rsvp.pk])
+
+        list_etag = self.client.get(self.rsvp_list)["ETag"]
+        detail_etag = self.client.get(detail_url)["ETag"]
+        self.assertEqual(self.client.get(self.rsvp_list, HTTP_IF_NONE_MATCH=list_etag).status_code, 304)
+        self.assertEqual(self.client.get(detail_url, HTTP_IF_NONE_MATCH=detail_etag).status_code, 304)
+
+        other = User.objects.create_user(username="bob", password="pass")
+        RSVP.objects.create(user=other, event=self.event)
+        self.assertEqual(self.client.get(self.rsvp_list, HTTP_IF_NONE_MATCH=list_etag).status_code, 200)
+
+    def test_bulk_rsvp_skips_existing_and_counts(self):
+        others = [User.objects.create_user(username=f"u{i}", password="pass") for i in range(5)]
+        RSVP.objects.create(user=self.user, event=self.event)
+        self.client.force_authenticate(user=self.user) # type: ignore
+
+        payload = [{"event": self.event.pk, "user": user.pk} for user in others]
+        payload += [
+            {"event": self.event.pk, "user": self.user.pk},  # already exists
+            {"event": self.event.pk, "user": others[0].pk},  # repeats item 0
+            {"event": self.event.pk, "user": 999999},  # unknown user
+        ]
+        resp = self.client.post(reverse("rsvp-bulk"), payload, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_207_MULTI_STATUS)
+        body = resp.json()
+        self.assertEqual((body["created"], body["skipped"], body["failed"]), (5, 2, 1))
+        self.assertTrue(all(result["id"] for result in body["results"][:5]))
+        self.assertEqual(body["results"][7]["status"], "error")
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendee_count, 6)
+        self.assertEqual(RSVP.objects.filter(event=self.event).count(), 6)
+
+    def test_bulk_rsvp_all_invalid_is_400(self):
+        self.client.force_authenticate(user=self.user) # type: ignore
+        resp = self.client.post(reverse("rsvp-bulk"), [{"event": 999999, "user": self.user.pk}], format="json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(resp.json()["failed"], 1)
+
+class RSVPLookupTests(APITestCase):
+    """?event= / ?user= filters and the nested RSVP routes stay indexed and O(1) in queries"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="alice", password="pass")
+        category = Category.objects.create(name="TestCat")
+        cls.event, cls.other_event = Event.objects.bulk_create(
+            Event(
+                title=f"Event {i}",
+                description="fun",
+                date_time=timezone.now(),
+                location="here",
+                price=0,
+                category=category,
+                creator=cls.user,
+            )
+            for i in range(2)
+        )
+        users = User.objects.bulk_create(User(username=f"guest{i}") for i in range(30))
+        RSVP.objects.bulk_create(RSVP(user=user, event=cls.event) for user in users)
+        RSVP.objects.bulk_create(RSVP(user=cls.user, event=event) for event in (cls.event, cls.other_event))
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user) # type: ignore
+
+    def get(self, url, **params):
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.get(url, params)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.content)
+        return resp.json()["results"], queries
+
+    def assert_indexed(self, queries):
+        if connection.vendor != "sqlite":
+            return
+        for query in queries:
+            if "events_rsvp" not in query["sql"]:
+                continue
+            with connection.cursor() as cursor:
+                cursor.execute("EXPLAIN QUERY PLAN " + query["sql"])
+                details = [row[-1] for row in cursor.fetchall()]
+            self.assertFalse([d for d in details if d == "SCAN events_rsvp"], query["sql"])
+            self.assertFalse([d for d in details if "TEMP B-TREE" in d], query["sql"])
+
+    def test_filter_by_event_and_user(self):
+        url = reverse("rsvp-list")
+        results, queries = self.get(url, event=self.other_event.pk)
+        self.assertEqual([r["user"] for r in results], [self.user.pk])
+        self.assert_indexed(queries)
+
+        results, queries = self.get(url, user=self.user.pk)
+        self.assertEqual({r["event"] for r in results}, {self.event.pk, self.other_event.pk})
+        self.assert_indexed(queries)
+
+        resp = self.client.get(url, {"event": "abc"})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("event", resp.json())
+
+        # Past the largest 64-bit id: rejected, not sent to the database
+        for name in ("event", "user"):
+            resp = self.client.get(url, {name: str(2**63)})
+            self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn(name, resp.json())
+
+    def test_event_rsvps_route(self):
+        url = reverse("event-rsvps", args=[self.event.pk])
+        results, queries = self.get(url, page_size=10)
+        self.assertEqual(len(results), 10)
+        # Event lookup + page, regardless of page size
+        self.assertEqual(len(queries), 2)
+        self.assert_indexed(queries)
+
+        _, queries = self.get(url, page_size=31)
+        self.assertEqual(len(queries), 2)
+
+        resp = self.client.get(reverse("event-rsvps", args=[999999]))
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_my_rsvps_route(self):
+        url = reverse("my-rsvps")
+        results, queries = self.get(url)
+        self.assertEqual({r["event"] for r in results}, {self.event.pk, self.other_event.pk})
+        self.assertEqual(len(queries), 1)
+        self.assert_indexed(queries)
+
+        self.client.force_authenticate(user=None) # type: ignore
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+
+def _event_payload(test):
+    return {
+        "title": "Budgeted",
+        "description": "Budgeted event",
+        "date_time": "2026-11-01T18:00:00Z",
+        "location": "here",
+        "price": "0.00",
+        "category": test.category.pk,
+        "creator": test.host.pk,
+    }
+
+
+def _guest_rsvp_url(test):
+    return reverse("rsvp-detail", args=[RSVP.objects.get(user=test.guest, event=test.event).pk])
+
+
+class APIQueryBudgetTests(QueryBudgetMixin, APITestCase):
+    """Every API route runs the same, budgeted number of queries with 1 or 500 rows."""
+
+    # (route name, method, budget, user, path, JSON body); see config/query_budget.py
+    ENDPOINTS = [
+        ("api-root", "get", 0, None, lambda t: reverse("api-root"), None),
+        ("event-list", "get", 2, None, lambda t: reverse("event-list"), None),
+        ("event-list", "post", 5, "host", lambda t: reverse("event-list"), _event_payload),
+        ("event-detail", "get", 2, None, lambda t: reverse("event-detail", args=[t.event.pk]), None),
+        (
+            "event-detail",
+            "patch",
+            4,
+            "host",
+            lambda t: reverse("event-detail", args=[t.event.pk]),
+            lambda t: {"title": "Renamed"},
+        ),
+        ("event-rsvps", "get", 2, None, lambda t: reverse("event-rsvps", args=[t.event.pk]), None),
+        ("event-bulk", "post", 7, "host", lambda t: reverse("event-bulk"), lambda t: [_event_payload(t)] * 3),
+        ("rsvp-list", "get", 4, "host", lambda t: reverse("rsvp-list"), None),
+        (
+            "rsvp-list",
+            "post",
+            9,
+            "guest",
+            lambda t: reverse("rsvp-list"),
+            lambda t: {"event": t.open_event.pk, "user": t.guest.pk},
+        ),
+        ("rsvp-detail", "get", 4, "guest", _guest_rsvp_url, None),
+        ("rsvp-detail", "delete", 5, "guest", _guest_rsvp_url, None),
+        (
+            "rsvp-bulk",
+            "post",
+            11,
+            "host",
+            lambda t: reverse("rsvp-bulk"),
+            lambda t: [{"event": t.open_event.pk, "user": user.pk} for user in (t.host, t.guest)],
+        ),
+        ("my-rsvps", "get", 3, "guest", lambda t: reverse("my-rsvps"), None),
+    ]
+
+    def test_query_budgets(self):
+        self.assertEndpointBudgets(self.ENDPOINTS)
+
+    def test_every_route_has_a_budget(self):
+        self.assertRoutesBudgeted("api.urls", self.ENDPOINTS)
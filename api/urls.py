@@ -1,11 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import EventViewSet, RSVPViewSet
+from .views import EventViewSet, MyRSVPList, RSVPViewSet
 
 router = DefaultRouter()
 router.register(r'events', EventViewSet)
 router.register(r'rsvps', RSVPViewSet)
 
 urlpatterns = [
+    path('users/me/rsvps/', MyRSVPList.as_view(), name='my-rsvps'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
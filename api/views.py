@@ -1,19 +1,265 @@
-from rest_framework import viewsets, permissions
-from events.models import Event, RSVP
-from .serializers import EventSerializer, RSVPSerializer
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Max
+from rest_framework import generics, permissions, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+
+from events.cache import bump_generation, bump_rsvp_generation
+from events.filters import EventFilter, RSVPFilterForm
+from events.models import RSVP, Event
+from events.services import RSVPRejected, create_rsvp, move_rsvp, rejection_reason, reserve_seats
+
+from .mixins import BulkCreateMixin, ConditionalGetMixin, FastListMixin
+from .pagination import EventCursorPagination, RSVPCursorPagination
 from .permissions import IsOwnerOrReadOnly
+from .serializers import BulkRSVPSerializer, EventSerializer, RSVPSerializer
+
+
+class EventViewSet(BulkCreateMixin, ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
+    """GET, POST, PUT, DELETE events
 
-class EventViewSet(viewsets.ModelViewSet):
-    """GET, POST, PUT, DELETE events"""
-    queryset = Event.objects.all()
+    The list accepts the same filters as the event list page, validated by
+    events.filters.EventFilter: ?q=&category=&date_from=&date_to=&price_min=
+    &price_max=&free_only=&my_events=&my_rsvps=&sort=&dir=
+    With ?q= and no sort, results come best match first.
+    Invalid values return 400 with per-field errors.
+
+    Reads are cursor paginated and accept ?fields=id,title,date_time to
+    return (and SELECT) only those fields. List pages are built from
+    values_list() rows (FastListMixin), not model instances. List and detail send an ETag
+    (detail also Last-Modified, see api/mixins.py) and answer 304 when nothing changed.
+
+    POST /api/events/bulk/ takes a list of events (see BulkCreateMixin).
+    GET /api/events/<id>/rsvps/ pages through that event's RSVPs.
+    """
+    queryset = Event.objects.select_related('category', 'creator')
     serializer_class = EventSerializer
+    pagination_class = EventCursorPagination
     permission_classes = [
         permissions.IsAuthenticatedOrReadOnly,
         IsOwnerOrReadOnly,
     ]
+    filter_spec = None
+    # Categories come from the in-memory registry (CategoryField)
+    bulk_prefetch = {'creator': get_user_model().objects.all()}
+
+    def perform_bulk_create(self, valid):
+        events = [Event(**data) for _, data in valid]
+        # bulk_create skips signals: invalidate cached lists ourselves
+        Event.objects.bulk_create(events, batch_size=self.bulk_batch_size)
+        bump_generation()
+        return {
+            index: {'index': index, 'status': 'created', 'id': event.pk}
+            for (index, _), event in zip(valid, events)
+        }
+
+    def list_fingerprint(self, queryset):
+        """MAX(updated_at) + COUNT over the filtered list, in one query.
+
+        RSVP changes touch Event.updated_at (events/signals.py) and deletes
+        change the count, so any change to the result set changes this.
+        The aggregate reads every matching row (from the index where the
+        filter allows), so a broad filter costs more than the page it
+        guards; it is still far cheaper than loading and serializing one.
+        """
+        stats = queryset.order_by().aggregate(last_modified=Max('updated_at'), total=Count('pk'))
+        return f"{stats['last_modified']}|{stats['total']}"
+
+    def object_fingerprint(self):
+        try:
+            updated_at = Event.objects.filter(pk=self.kwargs['pk']).values_list('updated_at', flat=True).first()
+        except (TypeError, ValueError):
+            return None
+        if updated_at is None:
+            return None
+        return updated_at.isoformat(), updated_at
+
+    def get_sparse_fields(self):
+        """Field names from ?fields=, validated against the serializer. Event reads only."""
+        if self.request.method not in permissions.SAFE_METHODS or self.action not in ('list', 'retrieve'):
+            return None
+        raw = self.request.query_params.get('fields')
+        if not raw:
+            return None
+        fields = [name.strip() for name in raw.split(',') if name.strip()]
+        unknown = sorted(set(fields) - set(EventSerializer.Meta.fields))
+        if unknown:
+            raise ValidationError({'fields': [f'Unknown field: {name}' for name in unknown]})
+        return fields
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'] = self.get_sparse_fields()
+        return context
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'retrieve':
+            # Same single-query loader as the HTML detail page
+            queryset = Event.objects.for_detail(self.request.user)
+        elif self.action == 'list':
+            spec = EventFilter(self.request.query_params, self.request.user)
+            if not spec.is_valid():
+                raise ValidationError(spec.errors)
+            self.filter_spec = spec
+            queryset = spec.filter(queryset).order_by(*spec.ordering)
+        else:
+            return queryset
+
+        fields = self.get_sparse_fields()
+        if fields:
+            queryset = self.restrict_columns(queryset, fields)
+        return queryset
+
+    def restrict_columns(self, queryset, fields):
+        """SELECT only the requested columns (plus id and the sort key the cursor needs)"""
+        columns = {'id', *fields}
+        if self.filter_spec is not None and self.filter_spec.order_field != 'search_rank':
+            columns.add(self.filter_spec.order_field)
+        # Joining a relation nobody asked for would load columns we just deferred
+        queryset = queryset.select_related(None)
+        related = [name for name in ('category', 'creator') if name in columns]
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only(*columns)
+
+    @action(detail=True, methods=['get'], serializer_class=RSVPSerializer, pagination_class=RSVPCursorPagination)
+    def rsvps(self, request, pk=None):
+        """Who is attending: one pk lookup (404s) + one indexed page query"""
+        event = self.get_object()
+        page = self.paginate_queryset(RSVP.objects.filter(event=event))
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
-class RSVPViewSet(viewsets.ModelViewSet):
-    """GET, POST, PUT, DELETE RSVPs"""
-    queryset = RSVP.objects.all()
+class RSVPViewSet(BulkCreateMixin, ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
+    """GET, POST, PUT, DELETE RSVPs
+
+    Reads send an ETag (detail also Last-Modified). Every RSVP write touches its
+    event's updated_at, so the fingerprints follow the parent events.
+
+    The list filters with ?event=<id> and/or ?user=<id> (events.filters.
+    RSVPFilterForm) and is cursor paginated newest first.
+
+    Creating (or moving) an RSVP goes through events.services, which
+    enforces Event.capacity and rejects cancelled events.
+
+    POST /api/rsvps/bulk/ takes a list of RSVPs (see BulkCreateMixin).
+    RSVPs that already exist, or repeat an earlier item, are reported as
+    "skipped" rather than errors so a partner can safely retry a batch.
+    """
+    queryset = RSVP.objects.select_related('event', 'user')
+    serializer_class = RSVPSerializer
+    pagination_class = RSVPCursorPagination
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    bulk_serializer_class = BulkRSVPSerializer
+    bulk_prefetch = {
+        'event': Event.objects.all(),
+        'user': get_user_model().objects.all(),
+    }
+
+    def perform_bulk_create(self, valid):
+        pairs = {(data['event'].pk, data['user'].pk) for _, data in valid}
+        event_ids = {event_id for event_id, _ in pairs}
+        user_ids = {user_id for _, user_id in pairs}
+        existing = set(
+            RSVP.objects.filter(event_id__in=event_ids, user_id__in=user_ids).values_list('event_id', 'user_id')
+        )
+
+        results = {}
+        new = {}
+        for index, data in valid:
+            pair = (data['event'].pk, data['user'].pk)
+            if pair in existing or pair in new:
+                results[index] = {'index': index, 'status': 'skipped', 'detail': 'Already RSVPed.'}
+            else:
+                new[pair] = index
+        # Capacity: one conditional UPDATE per event takes all of its seats or none
+        by_event = {}
+        for pair in new:
+            by_event.setdefault(pair[0], []).append(pair)
+        for event_id, event_pairs in by_event.items():
+            if not reserve_seats(event_id, len(event_pairs)):
+                reason = rejection_reason(event_id)
+                for pair in event_pairs:
+                    index = new.pop(pair)
+                    results[index] = {'index': index, 'status': 'error', 'errors': {'event': [reason]}}
+        if not new:
+            return results
+
+        # ignore_conflicts covers a concurrent request inserting the same pair
+        RSVP.objects.bulk_create(
+            [RSVP(event_id=event_id, user_id=user_id) for event_id, user_id in new],
+            batch_size=self.bulk_batch_size,
+            ignore_conflicts=True,
+        )
+        # Recount from the table: exact even if ignore_conflicts dropped a row
+        touched = Event.objects.filter(pk__in={event_id for event_id, _ in new})
+        touched.refresh_attendee_counts()
+        bump_rsvp_generation()
+
+        # With ignore_conflicts the database doesn't hand back ids
+        ids = {
+            (event_id, user_id): pk
+            for pk, event_id, user_id in RSVP.objects.filter(
+                event_id__in=event_ids, user_id__in=user_ids
+            ).values_list('pk', 'event_id', 'user_id')
+        }
+        for pair, index in new.items():
+            results[index] = {'index': index, 'status': 'created', 'id': ids.get(pair)}
+        return results
+
+    def perform_create(self, serializer):
+        data = serializer.validated_data
+        try:
+            rsvp, created = create_rsvp(data['user'], data['event'].pk)
+        except RSVPRejected as error:
+            raise ValidationError({'event': [str(error)]})
+        if not created:
+            raise ValidationError({'non_field_errors': ['Already RSVPed.']})
+        serializer.instance = rsvp
+
+    def perform_update(self, serializer):
+        event = serializer.validated_data.get('event')
+        if event is not None and event.pk != serializer.instance.event_id:
+            # Moving to another event takes a seat there like a new RSVP
+            try:
+                move_rsvp(serializer.instance, event.pk)
+            except RSVPRejected as error:
+                raise ValidationError({'event': [str(error)]})
+        serializer.save()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            form = RSVPFilterForm(self.request.query_params)
+            if not form.is_valid():
+                raise ValidationError(form.errors)
+            queryset = form.filter(queryset)
+        return queryset
+
+    def list_fingerprint(self, queryset):
+        stats = queryset.order_by().aggregate(last_modified=Max('event__updated_at'), total=Count('pk'))
+        return f"{stats['last_modified']}|{stats['total']}"
+
+    def object_fingerprint(self):
+        try:
+            row = (
+                RSVP.objects.filter(pk=self.kwargs['pk'])
+                .values_list('event_id', 'user_id', 'event__updated_at')
+                .first()
+            )
+        except (TypeError, ValueError):
+            return None
+        if row is None:
+            return None
+        event_id, user_id, updated_at = row
+        return f'{event_id}|{user_id}|{updated_at.isoformat()}', updated_at
+
+class MyRSVPList(generics.ListAPIView):
+    """GET /api/users/me/rsvps/: the logged-in user's RSVPs, newest first"""
     serializer_class = RSVPSerializer
-    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
\ No newline at end of file
+    pagination_class = RSVPCursorPagination
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return RSVP.objects.filter(user=self.request.user)
@@ -0,0 +1,269 @@
+"""
+Opt-in request profiling: where did a slow request spend its time?
+
+With PROFILING=1, ProfilingMiddleware times every request and adds a
+Server-Timing header, which browser dev tools show next to the request:
+
+    Server-Timing: sql;dur=12.4;desc="7 queries", template;dur=3.1, python;dur=8.0, view;dur=21.9, total;dur=23.5
+
+    sql       every query, middleware included
+    template  rendering, minus the queries run while rendering
+    python    everything else: total - sql - template
+    view      the view alone, from its first line to its response (sql and
+              template included)
+    total     the request through every middleware below this one
+
+Requests slower than PROFILE_SLOW_REQUEST_MS, and requests running a query
+slower than PROFILE_SLOW_QUERY_MS, are written to the "config.profiling"
+logger as one JSON object per line: the timings above, and for each slow
+query its SQL (without parameters, which may be personal data), the
+project frames that ran it and its EXPLAIN plan.
+
+Off (the default), the middleware raises MiddlewareNotUsed and Django drops
+it at startup; nothing is wrapped and the only cost left is one context
+variable lookup per template render (ProfilingTemplates).
+"""
+
+import json
+import logging
+import time
+import traceback
+from contextvars import ContextVar
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, connections
+from django.db.backends.signals import connection_created
+from django.template.backends.django import DjangoTemplates, Template
+
+logger = logging.getLogger(__name__)
+
+MAX_SLOW_QUERIES = 20  # Per request; the rest are only counted
+
+_HERE = Path(__file__).resolve()
+
+# Profile of the current request; None outside of one (or with PROFILING off)
+_profile = ContextVar("request_profile", default=None)
+
+
+class RequestProfile:
+    """Timings of one request, in seconds."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total = None
+        self.view_started = None
+        self.view = None
+        self.sql = 0.0
+        self.queries = 0
+        self.template = 0.0
+        self.rendering = 0  # Template render depth; only the outermost counts
+        self.slow_queries = []  # (seconds, alias, sql, params, stack)
+        self.slow_dropped = 0
+
+    def server_timing(self):
+        python = self.total - self.sql - self.template
+        metrics = [
+            f'sql;dur={self.sql * 1000:.1f};desc="{self.queries} queries"',
+            f"template;dur={self.template * 1000:.1f}",
+            f"python;dur={max(python, 0) * 1000:.1f}",
+        ]
+        if self.view is not None:
+            metrics.append(f"view;dur={self.view * 1000:.1f}")
+        metrics.append(f"total;dur={self.total * 1000:.1f}")
+        return ", ".join(metrics)
+
+
+def project_stack():
+    """
+    "path:line in function" for each project frame, outermost first. Stops at
+    a sync_to_async hop: beyond it is whatever was waiting on the event loop.
+    """
+    base = Path(settings.BASE_DIR).resolve()
+    frames = []
+    for frame in reversed(traceback.extract_stack()[:-1]):
+        if frame.filename.startswith("<"):  # <string>, <frozen ...>
+            continue
+        path = Path(frame.filename).resolve()
+        if path.name == "sync.py" and frame.name == "thread_handler":
+            frames.append("(sync_to_async)")
+            break
+        if path != _HERE and "site-packages" not in path.parts and path.is_relative_to(base):
+            frames.append(f"{path.relative_to(base)}:{frame.lineno} in {frame.name}")
+    return frames[::-1]
+
+
+def _record_query(execute, sql, params, many, context):
+    profile = _profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    began = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - began
+        profile.sql += elapsed
+        profile.queries += 1
+        if elapsed * 1000 >= settings.PROFILE_SLOW_QUERY_MS:
+            if len(profile.slow_queries) < MAX_SLOW_QUERIES:
+                alias = context["connection"].alias
+                profile.slow_queries.append((elapsed, alias, sql, None if many else params, project_stack()))
+            else:
+                profile.slow_dropped += 1
+
+
+def _instrument(connection, **kwargs):
+    """Put _record_query on ``connection`` (first, so execute_wrapper() exits still pop their own)."""
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _record_query)
+
+
+def _instrument_thread():
+    """Every connection this thread has already opened."""
+    for connection in connections.all(initialized_only=True):
+        _instrument(connection)
+
+
+def explain(alias, sql, params):
+    """The plan of one SELECT, a line per row; None for anything else."""
+    if params is None or not sql.lstrip().upper().startswith(("SELECT", "WITH")):
+        return None
+    connection = connections[alias]
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}", params)
+            return [str(row[-1]) for row in cursor.fetchall()]
+    except DatabaseError as error:
+        return [f"EXPLAIN failed: {error}"]
+
+
+class ProfiledTemplate(Template):
+    def render(self, context=None, request=None):
+        profile = _profile.get()
+        if profile is None:
+            return super().render(context, request)
+        profile.rendering += 1
+        began, sql = time.perf_counter(), profile.sql
+        try:
+            return super().render(context, request)
+        finally:
+            profile.rendering -= 1
+            if not profile.rendering:
+                profile.template += time.perf_counter() - began - (profile.sql - sql)
+
+
+class ProfilingTemplates(DjangoTemplates):
+    """DjangoTemplates whose templates add their render time to the request profile."""
+
+    def from_string(self, template_code):
+        return ProfiledTemplate(super().from_string(template_code).template, self)
+
+    def get_template(self, template_name):
+        return ProfiledTemplate(super().get_template(template_name).template, self)
+
+
+class ProfilingMiddleware:
+    """
+    Server-Timing header and slow log for every request (see module docstring).
+
+    Goes first in MIDDLEWARE so session and user queries are counted. Sync
+    and async, like config.router.PrimaryStickinessMiddleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.instrumented_orm_thread = False
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            # Django runs a sync process_view on a thread in async mode
+            self.process_view = self.aprocess_view
+        # New connections, in any thread; already open ones on first use
+        connection_created.connect(_instrument, dispatch_uid="config.profiling")
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        profile, token = self.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            _profile.reset(token)
+        self.finish(profile, response)
+        if self.is_slow(profile):
+            self.log(request, response, profile)
+        return response
+
+    async def __acall__(self, request):
+        if not self.instrumented_orm_thread:
+            # The thread sync_to_async runs the ORM on may have connected
+            # before this middleware existed
+            await sync_to_async(_instrument_thread)()
+            self.instrumented_orm_thread = True
+        profile, token = self.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _profile.reset(token)
+        self.finish(profile, response)
+        if self.is_slow(profile):
+            await sync_to_async(self.log)(request, response, profile)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        self.view_starts()
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        self.view_starts()
+
+    def view_starts(self):
+        profile = _profile.get()
+        if profile is not None:
+            profile.view_started = time.perf_counter()
+
+    def start(self):
+        _instrument_thread()
+        profile = RequestProfile()
+        return profile, _profile.set(profile)
+
+    def finish(self, profile, response):
+        now = time.perf_counter()
+        profile.total = now - profile.started
+        if profile.view_started is not None:
+            profile.view = now - profile.view_started
+        response["Server-Timing"] = profile.server_timing()
+
+    def is_slow(self, profile):
+        return profile.slow_queries or profile.total * 1000 >= settings.PROFILE_SLOW_REQUEST_MS
+
+    def log(self, request, response, profile):
+        """One JSON line on the slow log. Runs after the response, outside the profile."""
+        record = {
+            "method": request.method,
+            "path": request.get_full_path(),
+            "status": response.status_code,
+            "total_ms": round(profile.total * 1000, 1),
+            "view_ms": None if profile.view is None else round(profile.view * 1000, 1),
+            "sql_ms": round(profile.sql * 1000, 1),
+            "queries": profile.queries,
+            "template_ms": round(profile.template * 1000, 1),
+            "slow_queries": [
+                {
+                    "ms": round(elapsed * 1000, 1),
+                    "database": alias,
+                    "sql": sql,
+                    "stack": stack,
+                    "explain": explain(alias, sql, params),
+                }
+                for elapsed, alias, sql, params, stack in profile.slow_queries
+            ],
+        }
+        if profile.slow_dropped:
+            record["slow_queries_not_shown"] = profile.slow_dropped
+        logger.warning(json.dumps(record, default=str))
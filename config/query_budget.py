@@ -0,0 +1,223 @@
+"""
+Query budgets for tests: every endpoint declares how many queries it may
+run, and that number must not depend on how much data there is.
+
+An N+1 (a query per row) passes any test with one row of data. Here each
+endpoint is requested twice, once with BUDGET_ROWS[0] rows and once with
+BUDGET_ROWS[1], each in its own rolled-back savepoint, and must run the
+same number of queries both times, within its budget. On failure the
+message lists every query, grouped by the line of project code that ran
+it.
+
+Usage (see events/tests.py, api/tests.py, accounts/tests.py):
+
+    class EventQueryBudgetTests(QueryBudgetMixin, TestCase):
+        ENDPOINTS = [
+            # (route name, method, budget, user attribute or None, path(test), data(test) or None)
+            ("event_list", "get", 3, None, lambda t: reverse("events:event_list"), None),
+        ]
+
+        def test_query_budgets(self):
+            self.assertEndpointBudgets(self.ENDPOINTS)
+
+        def test_every_route_has_a_budget(self):
+            self.assertRoutesBudgeted("events.urls", self.ENDPOINTS)
+"""
+
+import traceback
+from collections import defaultdict
+from contextlib import contextmanager
+from decimal import Decimal
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.utils import timezone
+
+BUDGET_ROWS = (1, 500)
+
+_HERE = Path(__file__).resolve()
+
+
+def call_site():
+    """file:line of the innermost project frame (not this module or a test), or a placeholder."""
+    base = Path(settings.BASE_DIR).resolve()
+    for frame in reversed(traceback.extract_stack()[:-1]):
+        path = Path(frame.filename).resolve()
+        if path.name == "sync.py" and frame.name == "thread_handler":
+            # sync_to_async hop: the frames further out are whatever was
+            # waiting on the event loop, not the code that ran the query
+            return "(async ORM call: the awaiting coroutine isn't on the stack)"
+        if path == _HERE or path.name == "tests.py" or "site-packages" in path.parts:
+            continue
+        if path.is_relative_to(base):
+            return f"{path.relative_to(base)}:{frame.lineno} in {frame.name}"
+    return "(no project frame: Django internals)"
+
+
+class QueryLog:
+    """Context manager recording (sql, call site) for every query on ``connection``."""
+
+    def __init__(self, using=connection):
+        self.connection = using
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((sql, call_site()))
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self._wrapper = self.connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._wrapper.__exit__(*exc_info)
+
+    def __len__(self):
+        return len(self.queries)
+
+    def report(self):
+        """The queries grouped by call site, busiest first."""
+        sites = defaultdict(list)
+        for sql, site in self.queries:
+            sites[site].append(sql)
+        lines = []
+        for site, statements in sorted(sites.items(), key=lambda item: -len(item[1])):
+            lines.append(f"  {len(statements)} x {site}")
+            lines.extend(f"      {sql}" for sql in statements)
+        return "\n".join(lines)
+
+
+def route_names(urlconf):
+    """Every named route in ``urlconf`` (a module path), includes followed."""
+    names = set()
+
+    def walk(patterns):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                walk(pattern.url_patterns)
+            elif isinstance(pattern, URLPattern) and pattern.name:
+                names.add(pattern.name)
+
+    walk(get_resolver(urlconf).url_patterns)
+    return names
+
+
+class QueryBudgetMixin:
+    """
+    For TestCase / APITestCase. Creates a host, a guest, a category and two
+    events; fill() adds the rows that make an N+1 show up.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        from events.models import Category
+
+        User = get_user_model()
+        cls.host = User.objects.create_user(username="host", password="pass")
+        cls.guest = User.objects.create_user(username="guest", password="pass")
+        cls.category = Category.objects.create(name="TestCat")
+        cls.event = cls.make_event("Budget event")  # Guest attends (see fill)
+        cls.open_event = cls.make_event("Open event")  # Guest doesn't
+
+    @classmethod
+    def make_event(cls, title, **fields):
+        from events.models import Event
+
+        return Event.objects.create(
+            **{
+                "title": title,
+                "description": "",
+                "date_time": timezone.now(),
+                "location": "here",
+                "price": Decimal("0.00"),
+                "category": cls.category,
+                "creator": cls.host,
+                **fields,
+            }
+        )
+
+    def fill(self, rows):
+        """
+        ``rows`` of everything a page could loop over: users, events by the
+        host (each RSVPed by the guest), and RSVPs on self.event.
+        """
+        from events.models import RSVP, Event
+
+        User = get_user_model()
+        users = User.objects.bulk_create(User(username=f"budget{i}") for i in range(rows))
+        events = Event.objects.bulk_create(
+            Event(
+                title=f"Budget {i}",
+                description="",
+                date_time=timezone.now(),
+                location="there",
+                category=self.category,
+                creator=self.host,
+            )
+            for i in range(rows)
+        )
+        RSVP.objects.bulk_create(
+            [RSVP(user=user, event=self.event) for user in users]
+            + [RSVP(user=self.guest, event=event) for event in [self.event, *events]]
+        )
+        Event.objects.all().refresh_attendee_counts()
+
+    def reset_caches(self):
+        from accounts.backends import forget_user
+        from events.categories import clear_categories
+
+        for cache in caches.all():
+            cache.clear()
+        clear_categories()
+        forget_user()
+
+    @contextmanager
+    def rolled_back(self):
+        with transaction.atomic():
+            yield
+            transaction.set_rollback(True)
+
+    def measure(self, rows, user, method, path, data):
+        """Fill, then request once. Returns (response, QueryLog); all rolled back."""
+        with self.rolled_back():
+            self.fill(rows)
+            self.reset_caches()
+            if user is None:
+                self.client.logout()
+            else:
+                self.client.force_login(getattr(self, user))
+            url = path(self)
+            kwargs = {"data": data(self)} if data else {}
+            if data and hasattr(self.client, "_credentials"):
+                kwargs["format"] = "json"  # APIClient
+            with QueryLog() as log:
+                response = getattr(self.client, method)(url, **kwargs)
+                if response.streaming:
+                    b"".join(response.streaming_content)
+        return response, log
+
+    def assertQueryBudget(self, name, method, budget, user, path, data):
+        runs = [(rows, *self.measure(rows, user, method, path, data)) for rows in BUDGET_ROWS]
+        for rows, response, log in runs:
+            body = b"" if response.streaming else response.content[:1000]
+            self.assertLess(response.status_code, 400, f"{name} {method.upper()} with {rows} rows: {body!r}")
+        counts = [len(log) for _, _, log in runs]
+        if len(set(counts)) > 1 or counts[-1] > budget:
+            reports = "\n".join(f"With {rows} rows, {len(log)} queries:\n{log.report()}" for rows, _, log in runs)
+            self.fail(f"{name} {method.upper()}: budget {budget}, ran {counts}\n{reports}")
+
+    def assertEndpointBudgets(self, endpoints):
+        for endpoint in endpoints:
+            with self.subTest(route=endpoint[0], method=endpoint[1]):
+                self.assertQueryBudget(*endpoint)
+
+    def assertRoutesBudgeted(self, urlconf, endpoints):
+        budgeted = {endpoint[0] for endpoint in endpoints}
+        routes = route_names(urlconf)
+        self.assertEqual(routes - budgeted, set(), f"Routes in {urlconf} without a query budget")
+        self.assertEqual(budgeted - routes, set(), f"Budgets for routes that aren't in {urlconf}")
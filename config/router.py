@@ -0,0 +1,141 @@
+"""
+Read replicas: send read-only ORM traffic to replica aliases, writes to
+the primary ("default").
+
+Enabled by DATABASE_REPLICA_URLS (see config/database.py), which adds
+aliases replica1, replica2, ... to DATABASES and lists them in
+settings.DATABASE_REPLICAS. With no replicas the router returns None
+everywhere and Django's defaults apply.
+
+Routing only happens inside a request handled by PrimaryStickinessMiddleware.
+Management commands, shell sessions and other background work read from
+the primary, so they always see their own writes.
+
+Within a request, reads go to a random replica until:
+    - the request writes (any db_for_write): the rest of the request reads
+      the primary, or
+    - a transaction is open on the primary: reads inside it stay there, or
+    - the client wrote within the last REPLICA_STICKY_SECONDS: a signed
+      cookie set on the write response pins its reads to the primary, so a
+      user who just RSVPed sees their own RSVP despite replication lag.
+"""
+
+import random
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PRIMARY = DEFAULT_DB_ALIAS
+STICKY_COOKIE = "primary_reads"
+STICKY_SALT = "config.router.sticky"
+
+# Routing state of the current request; None outside of one
+_request_state = ContextVar("replica_routing", default=None)
+
+
+class RequestRouting:
+    """Per-request routing state: pinned to the primary, and whether it wrote."""
+
+    __slots__ = ("pinned", "wrote")
+
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.wrote = False
+
+
+def replicas():
+    return getattr(settings, "DATABASE_REPLICAS", ())
+
+
+def reads_from_primary():
+    """True when reads right now must see the primary's latest writes."""
+    state = _request_state.get()
+    return state is None or state.pinned or state.wrote or connections[PRIMARY].in_atomic_block
+
+
+class ReplicaRouter:
+    """Database router; listed in settings.DATABASE_ROUTERS."""
+
+    def db_for_read(self, model, **hints):
+        aliases = replicas()
+        if not aliases:
+            return None
+        if reads_from_primary():
+            return PRIMARY
+        return random.choice(aliases)
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None:
+            state.wrote = True
+        return PRIMARY if replicas() else None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        databases = {PRIMARY, *replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema from the primary through replication
+        if db in replicas():
+            return False
+        return None
+
+
+class PrimaryStickinessMiddleware:
+    """
+    Sets up replica routing for each request and the sticky-primary cookie.
+
+    Goes first in MIDDLEWARE so session and user lookups are routed too.
+    Sync and async: under ASGI it doesn't push async views onto a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = self.routing(request)
+        token = _request_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_state.reset(token)
+        return self.stick(response, state)
+
+    async def __acall__(self, request):
+        state = self.routing(request)
+        token = _request_state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_state.reset(token)
+        return self.stick(response, state)
+
+    def routing(self, request):
+        window = settings.REPLICA_STICKY_SECONDS
+        pinned = request.get_signed_cookie(STICKY_COOKIE, default=None, salt=STICKY_SALT, max_age=window)
+        return RequestRouting(pinned=pinned is not None)
+
+    def stick(self, response, state):
+        if state.wrote and replicas():
+            response.set_signed_cookie(
+                STICKY_COOKIE,
+                int(time.time()),
+                salt=STICKY_SALT,
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
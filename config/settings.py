@@ -10,8 +10,13 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
+from .database import database_from_env, replicas_from_env, sqlite_profile
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -45,6 +50,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "config.profiling.ProfilingMiddleware",  # Only with PROFILING=1; times everything below
+    "config.router.PrimaryStickinessMiddleware",  # Before anything queries, so every query is routed
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -58,7 +65,7 @@ ROOT_URLCONF = "config.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "BACKEND": "config.profiling.ProfilingTemplates",  # DjangoTemplates, timed when profiling
         "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -75,15 +82,77 @@ TEMPLATES = [
 WSGI_APPLICATION = "config.wsgi.application"
 
 
+# Request profiling (config/profiling.py): PROFILING=1 adds a Server-Timing
+# header (sql, template, python, view, total) to every response and logs
+# slow requests and slow queries, with their stack and EXPLAIN plan, to the
+# "config.profiling" logger as JSON lines: stderr, or PROFILE_SLOW_LOG.
+PROFILING = os.environ.get("PROFILING") == "1"
+PROFILE_SLOW_REQUEST_MS = int(os.environ.get("PROFILE_SLOW_REQUEST_MS", 500))
+PROFILE_SLOW_QUERY_MS = int(os.environ.get("PROFILE_SLOW_QUERY_MS", 100))
+PROFILE_SLOW_LOG = os.environ.get("PROFILE_SLOW_LOG")
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "slow_log": (
+            {"class": "logging.handlers.WatchedFileHandler", "filename": PROFILE_SLOW_LOG}
+            if PROFILE_SLOW_LOG
+            else {"class": "logging.StreamHandler"}
+        ),
+    },
+    "loggers": {
+        "config.profiling": {"handlers": ["slow_log"], "level": "INFO", "propagate": False},
+    },
+}
+
+
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
+#
+# DATABASE_URL picks the backend (SQLite file by default, or PostgreSQL
+# with persistent or pooled connections). SQLITE_PROFILE=production turns
+# on WAL, busy_timeout, mmap and IMMEDIATE transactions for multi-worker
+# SQLite deployments. See config/database.py.
+
+SQLITE_PRAGMAS = sqlite_profile()["pragmas"]  # Applied to every new SQLite connection
 
 DATABASES = {
+    "default": database_from_env(BASE_DIR),
+    **replicas_from_env(BASE_DIR),
+}
+
+# Read replicas (DATABASE_REPLICA_URLS): read-only queries go to a replica,
+# except for REPLICA_STICKY_SECONDS after the same client wrote something.
+# See config/router.py.
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["config.router.ReplicaRouter"]
+REPLICA_STICKY_SECONDS = int(os.environ.get("REPLICA_STICKY_SECONDS", 5))
+
+
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+#
+# LocMemCache is per-process: with several workers, point this at a shared
+# backend (Redis/Memcached) so an event write invalidates every worker.
+
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "g4-event-optimizer",
+        "OPTIONS": {
+            "MAX_ENTRIES": 5000,
+        },
     }
 }
+
+# Event list result cache (events/cache.py). Any key left out falls back
+# to events.cache.DEFAULTS.
+EVENT_LIST_CACHE = {
+    "TIMEOUT": 60,  # Seconds
+    "MAX_IDS": 1000,  # Ids stored per filter/sort combination
+}
+
 # ============================================================
 #
 # IMPORTANT: This must be set BEFORE running migrations.
@@ -100,6 +169,16 @@ DATABASES = {
 # settings.AUTH_USER_MODEL will point to accounts.User.
 # ============================================================
 AUTH_USER_MODEL = "accounts.User"
+
+# ModelBackend plus a cache of the user each session resolves to, dropped
+# on save, delete and logout (see accounts/backends.py). Sessions remember
+# the backend that logged them in: plain ModelBackend stays listed so
+# sessions from before the cache keep working (uncached) until they end.
+AUTHENTICATION_BACKENDS = [
+    "accounts.backends.CachedModelBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
+AUTH_USER_CACHE_TIMEOUT = 30  # Seconds
 # Auth redirects
 LOGIN_REDIRECT_URL = "/events/"
 LOGOUT_REDIRECT_URL = "/accounts/login/"
@@ -110,6 +189,26 @@ SESSION_COOKIE_AGE = 86400
 SESSION_EXPIRE_AT_BROWSER_CLOSE = False
 SESSION_COOKIE_HTTPONLY = True
 
+# SESSION_STORE=cached_db (production): sessions are read from the cache,
+# written through to the database, and reloaded from the database when the
+# cache misses. Cache entries expire with the session (SESSION_COOKIE_AGE).
+# Needs a cache shared by every worker (see CACHES): with a per-process
+# cache, a logout in one worker would not reach the others' copies.
+SESSION_STORE = os.environ.get("SESSION_STORE", "db")
+if SESSION_STORE not in ("db", "cached_db"):
+    raise ImproperlyConfigured(f"SESSION_STORE must be db or cached_db, got {SESSION_STORE!r}")
+SESSION_ENGINE = f"django.contrib.sessions.backends.{SESSION_STORE}"
+
+# Django REST framework
+# https://www.django-rest-framework.org/api-guide/settings/
+
+REST_FRAMEWORK = {
+    # Never serialize a whole table in one response (see api/pagination.py)
+    "DEFAULT_PAGINATION_CLASS": "api.pagination.CursorPagination",
+    "PAGE_SIZE": 50,
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
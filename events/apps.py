@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class EventsConfig(AppConfig):
     name = "events"
+
+    def ready(self):
+        # Register signal receivers (attendee counter maintenance)
+        from . import signals  # noqa: F401
@@ -0,0 +1,393 @@
+import asyncio
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.template.loader import render_to_string
+from django.utils import timezone, translation
+from django.utils.safestring import mark_safe
+
+from .pagination import DEFAULT_PAGE_SIZE, KeysetPage, KeysetPaginator
+
+# Defaults for settings.EVENT_LIST_CACHE — override any subset there.
+DEFAULTS = {
+    "ALIAS": "default",  # Which entry in settings.CACHES to use
+    "TIMEOUT": 60,  # Seconds a result list lives even if nothing changes
+    "MAX_IDS": 1000,  # Longest id list stored per filter combination
+    "LOCK_TIMEOUT": 10,  # Seconds before an abandoned recompute lock expires
+    "LOCK_WAIT": 2.0,  # Seconds a miss waits for another worker's recompute
+    "CARD_TIMEOUT": 3600,  # Seconds a rendered event card fragment lives
+}
+
+GENERATION_KEY = "events:generation"
+# Only lists an RSVP can change (see list_cache_key) also carry this one
+RSVP_GENERATION_KEY = "events:rsvp-generation"
+
+# Striped locks for single-flight within this process: concurrent misses on
+# the same key queue behind one recompute instead of all hitting the DB.
+_LOCKS = [threading.Lock() for _ in range(64)]
+
+
+def cache_settings():
+    return {**DEFAULTS, **getattr(settings, "EVENT_LIST_CACHE", {})}
+
+
+def get_cache():
+    return caches[cache_settings()["ALIAS"]]
+
+
+# --- Generation ---
+#
+# Every cached list key includes the current "events generation". Any
+# Event write bumps it (see events/signals.py), which orphans every cached
+# list at once — no need to track which lists a row was in. RSVP writes
+# bump a second generation that only the lists an RSVP can change carry
+# (sorted by attendees, or filtered to my_rsvps), so RSVP-heavy traffic
+# doesn't evict the date, price and location sorted lists.
+# Orphaned entries simply expire after TIMEOUT.
+
+
+def current_generation(key=GENERATION_KEY):
+    cache = get_cache()
+    generation = cache.get(key)
+    if generation is None:
+        # Start from the clock, not 1: if the key is evicted we must never
+        # reuse a generation number that old entries were stored under.
+        cache.add(key, time.time_ns(), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+async def acurrent_generation(key=GENERATION_KEY):
+    """current_generation() for async views."""
+    cache = get_cache()
+    generation = await cache.aget(key)
+    if generation is None:
+        await cache.aadd(key, time.time_ns(), timeout=None)
+        generation = await cache.aget(key)
+    return generation
+
+
+def _bump(key):
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+    if connection.in_atomic_block:
+        # Readers may recompute from pre-commit data between now and the
+        # commit; bump again once the write is visible to everyone.
+        transaction.on_commit(lambda: _bump(key))
+
+
+def bump_generation():
+    """Invalidate every cached event list. Call after any Event write."""
+    _bump(GENERATION_KEY)
+
+
+def bump_rsvp_generation():
+    """Invalidate the cached lists RSVPs affect. Call after any RSVP write (or attendee_count repair)."""
+    _bump(RSVP_GENERATION_KEY)
+
+
+# --- Keys ---
+
+
+def _normalize(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if hasattr(value, "normalize"):
+        return str(value.normalize())  # Decimal("20") == Decimal("20.00")
+    return str(value)
+
+
+def list_cache_key(spec):
+    """
+    Key for one filter/sort combination at the current generation.
+
+    Filters that depend on who is asking (my_events, my_rsvps) get their
+    own per-user key space so one user's list is never served to another.
+    """
+    generation = current_generation()
+    if _depends_on_rsvps(spec):
+        generation = f"{generation}.{current_generation(RSVP_GENERATION_KEY)}"
+    return _list_cache_key(spec, generation)
+
+
+async def alist_cache_key(spec):
+    """list_cache_key() for async views."""
+    generation = await acurrent_generation()
+    if _depends_on_rsvps(spec):
+        generation = f"{generation}.{await acurrent_generation(RSVP_GENERATION_KEY)}"
+    return _list_cache_key(spec, generation)
+
+
+def _depends_on_rsvps(spec):
+    return spec.order_field == "attendee_count" or "my_rsvps" in spec.params
+
+
+def _list_cache_key(spec, generation):
+    params = {name: value for name, value in spec.params.items() if name not in ("sort", "dir")}
+    parts = [f"{name}={_normalize(value)}" for name, value in sorted(params.items())]
+    parts.append("order=" + ",".join(spec.ordering))
+    # Date filters resolve to local midnight, so the timezone is part of the question
+    parts.append("tz=" + timezone.get_current_timezone_name())
+    digest = hashlib.sha1("&".join(parts).encode()).hexdigest()
+
+    scope = "public"
+    if "my_events" in params or "my_rsvps" in params:
+        scope = f"user:{spec.user.pk}"
+    return f"events:list:{scope}:{generation}:{digest}"
+
+
+# --- Read-through with stampede protection ---
+
+
+def get_or_compute(key, compute):
+    """
+    Return the cached value for ``key``, computing it at most once.
+
+    Within a process, concurrent misses serialize on a lock and the first
+    one fills the cache for the rest. Across processes, a short-lived
+    cache.add() lock marks a recompute in progress and other workers wait
+    up to LOCK_WAIT seconds for it before giving up and computing
+    themselves (without storing).
+    """
+    config = cache_settings()
+    cache = get_cache()
+
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    with _LOCKS[hash(key) % len(_LOCKS)]:
+        value = cache.get(key)
+        if value is not None:
+            return value
+
+        lock_key = f"{key}:lock"
+        if cache.add(lock_key, True, timeout=config["LOCK_TIMEOUT"]):
+            try:
+                value = compute()
+                cache.set(key, value, timeout=config["TIMEOUT"])
+            finally:
+                cache.delete(lock_key)
+            return value
+
+        deadline = time.monotonic() + config["LOCK_WAIT"]
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            value = cache.get(key)
+            if value is not None:
+                return value
+
+    return compute()
+
+
+async def aget_or_compute(key, compute):
+    """
+    get_or_compute() for async views; ``compute`` is a coroutine function.
+
+    Threading locks would block the event loop, so the cache.add() lock is
+    the only single-flight guard here: it covers coroutines in this process
+    as well as other workers.
+    """
+    config = cache_settings()
+    cache = get_cache()
+
+    value = await cache.aget(key)
+    if value is not None:
+        return value
+
+    lock_key = f"{key}:lock"
+    if await cache.aadd(lock_key, True, timeout=config["LOCK_TIMEOUT"]):
+        try:
+            value = await compute()
+            await cache.aset(key, value, timeout=config["TIMEOUT"])
+        finally:
+            await cache.adelete(lock_key)
+        return value
+
+    deadline = time.monotonic() + config["LOCK_WAIT"]
+    while time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+        value = await cache.aget(key)
+        if value is not None:
+            return value
+
+    return await compute()
+
+
+def cached_event_ids(spec, queryset):
+    """
+    Ordered ids + total count for a filtered event queryset, cached.
+
+    Returns {"ids": [...], "count": int or None, "complete": bool}. Only
+    the first MAX_IDS ids are stored; "complete" is False when the result
+    set is longer, and pages past the stored ids fall back to a keyset
+    query. The count is then None: counting the rest would read the whole
+    filtered set, the full scan the keyset pages avoid.
+    """
+    max_ids = cache_settings()["MAX_IDS"]
+
+    def compute():
+        ids = list(queryset.order_by(*spec.ordering).values_list("pk", flat=True)[: max_ids + 1])
+        complete = len(ids) <= max_ids
+        count = len(ids) if complete else None
+        return {"ids": ids[:max_ids], "count": count, "complete": complete}
+
+    return get_or_compute(list_cache_key(spec), compute)
+
+
+async def acached_event_ids(spec, queryset):
+    """cached_event_ids() for async views, using the async ORM."""
+    max_ids = cache_settings()["MAX_IDS"]
+
+    async def compute():
+        ids = [pk async for pk in queryset.order_by(*spec.ordering).values_list("pk", flat=True)[: max_ids + 1]]
+        complete = len(ids) <= max_ids
+        count = len(ids) if complete else None
+        return {"ids": ids[:max_ids], "count": count, "complete": complete}
+
+    return await aget_or_compute(await alist_cache_key(spec), compute)
+
+
+class CachedKeysetPaginator(KeysetPaginator):
+    """
+    KeysetPaginator that serves pages from a cached id list.
+
+    Same cursors as KeysetPaginator, so links stay valid whether a page
+    came from the cache or the database. A page inside the cached ids
+    costs one primary-key lookup; anything else (cursor not in the list,
+    past the end of a truncated list) falls back to the keyset query.
+    """
+
+    def __init__(self, queryset, field, descending=False, page_size=DEFAULT_PAGE_SIZE, cached=None):
+        super().__init__(queryset, field, descending, page_size)
+        self.ids = cached["ids"]
+        self.count = cached["count"]
+        self.complete = cached["complete"]
+
+    def _window(self, after, before):
+        """(start, end) slice of self.ids for this page, or None to use the database."""
+        cursor = after or before
+        if cursor:
+            position = self.decode_cursor(cursor)
+            if position is None:
+                return None
+            try:
+                index = self.ids.index(position[1])
+            except ValueError:
+                return None
+            if after:
+                start = index + 1
+            else:
+                start = max(0, index - self.page_size)
+                return start, index
+        else:
+            start = 0
+
+        end = start + self.page_size
+        if end > len(self.ids) and not self.complete:
+            return None
+        return start, end
+
+    def page(self, after=None, before=None):
+        window = self._window(after, before)
+        if window is None:
+            page = super().page(after=after, before=before)
+        else:
+            start, end = window
+            page_ids = self.ids[start:end]
+            rows = self.queryset.in_bulk(page_ids)
+            # Rows deleted since the list was cached are simply skipped
+            object_list = [rows[pk] for pk in page_ids if pk in rows]
+            has_next = end < len(self.ids) or not self.complete
+            page = KeysetPage(object_list, self, has_next=has_next, has_previous=start > 0)
+        page.count = self.count
+        return page
+
+    async def apage(self, after=None, before=None):
+        """Async version of page()."""
+        window = self._window(after, before)
+        if window is None:
+            page = await super().apage(after=after, before=before)
+        else:
+            start, end = window
+            page_ids = self.ids[start:end]
+            rows = await self.queryset.ain_bulk(page_ids)
+            object_list = [rows[pk] for pk in page_ids if pk in rows]
+            has_next = end < len(self.ids) or not self.complete
+            page = KeysetPage(object_list, self, has_next=has_next, has_previous=start > 0)
+        page.count = self.count
+        return page
+
+
+# --- Card fragments ---
+#
+# Formatting dates, prices and names for hundreds of cards costs more than
+# the query that loaded them. Each card's HTML is cached under a key that
+# changes whenever the card would change: the event row (updated_at), its
+# attendee count (updated with F() so updated_at alone can't be trusted),
+# and the timezone/language the dates are formatted in. Category and
+# creator names almost never change; CARD_TIMEOUT bounds a stale rename.
+
+CARD_TEMPLATE = "events/_event_card.html"
+
+
+def card_cache_key(event):
+    stamp = event.updated_at.timestamp() if event.updated_at else ""
+    return (
+        f"events:card:{event.pk}:{stamp}:{event.attendee_count}:"
+        f"{timezone.get_current_timezone_name()}:{translation.get_language()}"
+    )
+
+
+def _render_missing_cards(keys, events, fragments):
+    """Render the cards whose fragment missed; returns {key: html} to store."""
+    return {
+        key: render_to_string(CARD_TEMPLATE, {"event": event})
+        for key, event in zip(keys, events)
+        if key not in fragments
+    }
+
+
+def _join_cards(keys, fragments):
+    # Fragments came from our own autoescaped template
+    return mark_safe("".join(fragments[key] for key in keys))
+
+
+def render_event_cards(events):
+    """
+    HTML for a sequence of event cards, assembled from cached fragments.
+
+    One get_many() for the whole page; only cards that missed are
+    rendered, and they're stored back with a single set_many().
+    """
+    cache = get_cache()
+    events = list(events)
+    keys = [card_cache_key(event) for event in events]
+    fragments = cache.get_many(keys)
+
+    missing = _render_missing_cards(keys, events, fragments)
+    if missing:
+        cache.set_many(missing, timeout=cache_settings()["CARD_TIMEOUT"])
+        fragments.update(missing)
+    return _join_cards(keys, fragments)
+
+
+async def arender_event_cards(events):
+    """render_event_cards() for async views: aget_many()/aset_many(), nothing blocks the loop."""
+    cache = get_cache()
+    events = list(events)
+    keys = [card_cache_key(event) for event in events]
+    fragments = await cache.aget_many(keys)
+
+    missing = _render_missing_cards(keys, events, fragments)
+    if missing:
+        await cache.aset_many(missing, timeout=cache_settings()["CARD_TIMEOUT"])
+        fragments.update(missing)
+    return _join_cards(keys, fragments)
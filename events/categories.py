@@ -0,0 +1,73 @@
+import threading
+
+from .models import Category
+
+# Process-local, read-through registry of Category rows.
+#
+# Why cache categories in memory?
+# - The list page, EventForm's dropdown and API validation all need the
+#   full category list, on nearly every request.
+# - Categories only change through data migrations (0002_seed_categories),
+#   so a copy per process is safe. Category save/delete and post_migrate
+#   clear it (see events/signals.py); other processes pick up migration
+#   changes on their next restart, which a deploy does anyway.
+#
+# Examples:
+#     all_categories()              # Tuple of Category, ordered by name
+#     await aall_categories()       # Same, from async views
+#     get_category(3)               # Category or None
+#     category_name(event.category_id)
+
+_lock = threading.Lock()
+_categories = None
+_by_pk = {}
+
+
+def _load():
+    global _categories, _by_pk
+    with _lock:
+        if _categories is None:
+            categories = tuple(Category.objects.all())  # Meta.ordering: by name
+            _by_pk = {category.pk: category for category in categories}
+            _categories = categories
+    return _categories
+
+
+def all_categories():
+    """Every category, ordered by name. Queries the database only on first use."""
+    categories = _categories
+    if categories is None:
+        categories = _load()
+    return categories
+
+
+async def aall_categories():
+    """all_categories() for async code: the first load uses the async ORM."""
+    global _categories, _by_pk
+    categories = _categories
+    if categories is None:
+        categories = tuple([category async for category in Category.objects.all()])
+        with _lock:
+            if _categories is None:
+                _by_pk = {category.pk: category for category in categories}
+                _categories = categories
+            categories = _categories
+    return categories
+
+
+def get_category(pk):
+    """The Category with this pk, or None if there isn't one."""
+    all_categories()
+    return _by_pk.get(pk)
+
+
+def category_name(pk):
+    category = get_category(pk)
+    return category.name if category else ""
+
+
+def clear_categories(**kwargs):
+    """Drop the cached copy. Connected to Category save/delete and post_migrate."""
+    global _categories
+    with _lock:
+        _categories = None
@@ -0,0 +1,126 @@
+import csv
+import json
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, StreamingHttpResponse
+from django.utils import timezone
+
+from .categories import category_name
+
+# Streaming exports: rows go from the database cursor to the response (or
+# file) one chunk at a time, so memory stays flat whether an export is a
+# thousand rows or ten million. Nothing here builds a list of rows.
+#
+# Examples:
+#     stream_export("csv", EVENT_COLUMNS, events)        # Iterator of str
+#     export_response(request, "ndjson", ATTENDEE_COLUMNS, rsvps, "attendees")
+
+CHUNK_SIZE = 2000  # Rows fetched from the database cursor at a time
+
+
+def _local_iso(value):
+    return timezone.localtime(value).isoformat()
+
+
+# (output name, values_list() column, converter or None)
+EVENT_COLUMNS = [
+    ("id", "id", None),
+    ("title", "title", None),
+    ("description", "description", None),
+    ("date_time", "date_time", _local_iso),
+    ("location", "location", None),
+    ("price", "price", str),
+    ("category", "category_id", category_name),  # Registry, no join
+    ("creator", "creator__username", None),
+    ("status", "status", None),
+    ("attendee_count", "attendee_count", None),
+]
+
+# Same information the creator sees on the event page
+ATTENDEE_COLUMNS = [
+    ("user_id", "user_id", None),
+    ("username", "user__username", None),
+    ("rsvped_at", "created_at", _local_iso),
+]
+
+
+def export_rows(queryset, columns, chunk_size=CHUNK_SIZE):
+    """Converted value lists, read through a chunked database cursor."""
+    converters = [convert for _, _, convert in columns]
+    rows = queryset.values_list(*[column for _, column, _ in columns]).iterator(chunk_size=chunk_size)
+    for row in rows:
+        yield [value if convert is None or value is None else convert(value) for convert, value in zip(converters, row)]
+
+
+async def aexport_rows(queryset, columns, chunk_size=CHUNK_SIZE):
+    """
+    export_rows() for the event loop: the same cursor, read a chunk at a time
+    on the request's sync thread. (QuerySet.aiterator() runs a values_list()
+    query on the loop itself.)
+    """
+    rows = export_rows(queryset, columns, chunk_size)
+    next_chunk = sync_to_async(lambda: list(islice(rows, chunk_size)))
+    while chunk := await next_chunk():
+        for row in chunk:
+            yield row
+
+
+class _Echo:
+    """File-like object for csv.writer that hands each line back instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def csv_writer(columns):
+    """(header line, row -> line) for CSV."""
+    writer = csv.writer(_Echo())
+    return writer.writerow([name for name, _, _ in columns]), writer.writerow
+
+
+def ndjson_writer(columns):
+    """(no header, row -> line) for newline-delimited JSON."""
+    names = [name for name, _, _ in columns]
+    return None, lambda row: json.dumps(dict(zip(names, row)), ensure_ascii=False) + "\n"
+
+
+FORMATS = {
+    "csv": (csv_writer, "text/csv; charset=utf-8"),
+    "ndjson": (ndjson_writer, "application/x-ndjson; charset=utf-8"),
+}
+
+
+def stream_export(fmt, columns, queryset, chunk_size=CHUNK_SIZE):
+    """Lines of ``queryset`` exported as ``fmt`` ("csv" or "ndjson")."""
+    header, write_line = FORMATS[fmt][0](columns)
+    if header is not None:
+        yield header
+    for row in export_rows(queryset, columns, chunk_size):
+        yield write_line(row)
+
+
+async def astream_export(fmt, columns, queryset, chunk_size=CHUNK_SIZE):
+    """stream_export() as an async iterator, for responses served under ASGI."""
+    header, write_line = FORMATS[fmt][0](columns)
+    if header is not None:
+        yield header
+    async for row in aexport_rows(queryset, columns, chunk_size):
+        yield write_line(row)
+
+
+def export_response(request, fmt, columns, queryset, filename):
+    """
+    StreamingHttpResponse download of ``queryset``. Unknown formats are a 404.
+
+    Under ASGI the response streams an async iterator: Django would read a
+    sync one into a list (sync_to_async(list)) before sending a byte, i.e.
+    the whole export in memory. Under WSGI it stays a plain generator.
+    """
+    if fmt not in FORMATS:
+        raise Http404(f"Unknown export format: {fmt}")
+    stream = astream_export if isinstance(request, ASGIRequest) else stream_export
+    response = StreamingHttpResponse(stream(fmt, columns, queryset), content_type=FORMATS[fmt][1])
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{fmt}"'
+    return response
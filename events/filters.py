@@ -0,0 +1,229 @@
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django import forms
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+# Largest id a 64-bit integer column holds; bigger ones overflow the driver
+MAX_ID = 2**63 - 1
+
+
+class EventFilterForm(forms.Form):
+    """
+    Validates the event list query parameters.
+
+    Every value is parsed here exactly once, so nothing user-supplied
+    reaches the ORM unchecked (e.g. "2026-02-30" never hits the database).
+
+    Parameters:
+        q                   Full-text search (title, description, location, category)
+        category            Category id
+        date_from, date_to  YYYY-MM-DD, inclusive, in the active timezone
+        price_min, price_max
+        free_only           price == 0
+        my_events           events the current user created (auth only)
+        my_rsvps            events the current user RSVPed to (auth only)
+        sort, dir           one of SORT_FIELDS, asc/desc
+    """
+
+    # Public sort names -> Event fields. Every field has an index ending
+    # in id (see Event.Meta.indexes) so sorted, paginated reads stay cheap.
+    SORT_FIELDS = {
+        "date": "date_time",
+        "price": "price",
+        "location": "location",
+        "attendees": "attendee_count",
+    }
+
+    q = forms.CharField(required=False, max_length=200)
+    category = forms.IntegerField(required=False, min_value=1, max_value=MAX_ID)
+    date_from = forms.DateField(required=False, input_formats=["%Y-%m-%d"])
+    date_to = forms.DateField(required=False, input_formats=["%Y-%m-%d"])
+    price_min = forms.DecimalField(required=False, min_value=0, max_digits=8, decimal_places=2)
+    price_max = forms.DecimalField(required=False, min_value=0, max_digits=8, decimal_places=2)
+    free_only = forms.BooleanField(required=False)
+    my_events = forms.BooleanField(required=False)
+    my_rsvps = forms.BooleanField(required=False)
+    sort = forms.ChoiceField(required=False, choices=[(name, name) for name in SORT_FIELDS])
+    dir = forms.ChoiceField(required=False, choices=[("asc", "asc"), ("desc", "desc")])
+
+    def clean(self):
+        cleaned_data = super().clean()
+
+        date_from = cleaned_data.get("date_from")
+        date_to = cleaned_data.get("date_to")
+        if date_from and date_to and date_from > date_to:
+            self.add_error("date_to", "End date must be on or after the start date.")
+
+        price_min = cleaned_data.get("price_min")
+        price_max = cleaned_data.get("price_max")
+        if price_min is not None and price_max is not None and price_min > price_max:
+            self.add_error("price_max", "Maximum price must be at least the minimum price.")
+
+        return cleaned_data
+
+
+def start_of_day(day, days_later=0):
+    """Aware datetime at local midnight of ``day`` (optionally N days later)."""
+    return timezone.make_aware(datetime.combine(day + timedelta(days=days_later), time.min))
+
+
+class EventFilter:
+    """
+    Parsed filter/sort spec for event queries, shared by the HTML event
+    list and the REST API.
+
+    Why one class for both?
+    - The list page and API clients ask the same questions (category,
+      dates, price, "mine"), so they should get the same answers.
+    - Filtering happens in the database against the Event indexes instead
+      of clients downloading everything and filtering themselves.
+
+    Invalid parameters are dropped from the spec: the HTML list ignores
+    them, the API reports them (see ``errors``) as a 400.
+
+    Example:
+        spec = EventFilter(request.GET, request.user)
+        events = spec.filter(Event.objects.all()).order_by(*spec.ordering)
+    """
+
+    def __init__(self, data, user=None):
+        self.data = data
+        self.user = user
+        self.form = EventFilterForm(data)
+        self.form.is_valid()  # Parse once; cleaned_data keeps only valid fields
+
+    # --- Validation ---
+
+    def is_valid(self):
+        return self.form.is_valid()
+
+    @property
+    def errors(self):
+        return self.form.errors
+
+    @cached_property
+    def params(self):
+        """Valid, non-empty parameters only. Auth-only filters need a logged-in user."""
+        params = {
+            name: value
+            for name, value in self.form.cleaned_data.items()
+            if value is not None and value != "" and value is not False
+        }
+        if not (self.user and self.user.is_authenticated):
+            # Auth-required filters: silently skip if not logged in
+            params.pop("my_events", None)
+            params.pop("my_rsvps", None)
+        return params
+
+    # --- Sorting ---
+
+    @property
+    def sort(self):
+        return self.params.get("sort", "")
+
+    @property
+    def order_field(self):
+        if self.sort:
+            return EventFilterForm.SORT_FIELDS[self.sort]
+        if "q" in self.params:
+            # Best match first: bm25 rank, lower is better
+            return "search_rank"
+        # Default ordering matches Meta (date_time ascending)
+        return "date_time"
+
+    @property
+    def descending(self):
+        return bool(self.sort) and self.params.get("dir") == "desc"
+
+    @property
+    def ordering(self):
+        """order_by() arguments: the sort field plus pk as a tie-breaker."""
+        prefix = "-" if self.descending else ""
+        return [f"{prefix}{self.order_field}", f"{prefix}pk"]
+
+    # --- Compiling to a queryset ---
+
+    def filter(self, queryset):
+        """
+        Apply the filters to an Event queryset.
+
+        Every condition compares a raw column so the indexes in
+        Event.Meta.indexes can serve it — no functions wrapped around
+        columns. Dates become a half-open range
+        [start of date_from, start of the day after date_to). A search
+        joins the FTS5 index (see events/search.py) and annotates
+        search_rank, which an explicit sort overrides.
+        """
+        params = self.params
+
+        if "q" in params:
+            queryset = queryset.search(params["q"])
+        if "category" in params:
+            queryset = queryset.filter(category_id=params["category"])
+        if "date_from" in params:
+            queryset = queryset.filter(date_time__gte=start_of_day(params["date_from"]))
+        if "date_to" in params and params["date_to"] < date.max:
+            # date.max has no next day to stop before: no upper bound at all
+            queryset = queryset.filter(date_time__lt=start_of_day(params["date_to"], days_later=1))
+        if "price_min" in params:
+            queryset = queryset.filter(price__gte=params["price_min"])
+        if "price_max" in params:
+            queryset = queryset.filter(price__lte=params["price_max"])
+        if "free_only" in params:
+            queryset = queryset.filter(price=Decimal("0.00"))
+        if "my_events" in params:
+            queryset = queryset.filter(creator=self.user)
+        if "my_rsvps" in params:
+            queryset = queryset.filter(rsvps__user=self.user)
+
+        return queryset
+
+    # --- Template helpers ---
+
+    @property
+    def current_filters(self):
+        """Raw submitted values, for repopulating the filter form."""
+        names = [
+            "q",
+            "category",
+            "date_from",
+            "date_to",
+            "price_min",
+            "price_max",
+            "free_only",
+            "my_events",
+            "my_rsvps",
+        ]
+        return {name: self.data.get(name, "") for name in names}
+
+    @property
+    def current_sort(self):
+        return {
+            "field": self.sort,
+            "dir": self.params.get("dir", "asc") if self.sort else "",
+        }
+
+
+class RSVPFilterForm(forms.Form):
+    """
+    Validates the RSVP list query parameters (REST API).
+
+    Parameters:
+        event   Event id: who is attending this event
+        user    User id: what this user has RSVPed to
+
+    Each maps onto an RSVP index leading with that column (see RSVP.Meta).
+    """
+
+    event = forms.IntegerField(required=False, min_value=1, max_value=MAX_ID)
+    user = forms.IntegerField(required=False, min_value=1, max_value=MAX_ID)
+
+    def filter(self, queryset):
+        """Apply the valid, non-empty filters to an RSVP queryset."""
+        for name in ("event", "user"):
+            value = self.cleaned_data.get(name)
+            if value is not None:
+                queryset = queryset.filter(**{f"{name}_id": value})
+        return queryset
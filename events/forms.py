@@ -1,9 +1,53 @@
 # events/forms.py
 
 from django import forms
+from django.core.exceptions import ValidationError
+from django.forms.models import ModelChoiceIterator
 
+from .categories import all_categories, get_category
 from .models import Event
 
+# What int() raises for a submitted value that is not an id
+_ID_ERRORS = (TypeError, ValueError)
+
+
+class CategoryChoiceIterator(ModelChoiceIterator):
+    """Dropdown options from the in-memory category registry, not a query."""
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        for category in all_categories():
+            yield self.choice(category)
+
+    def __len__(self):
+        return len(all_categories()) + (self.field.empty_label is not None)
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(all_categories())
+
+
+class CategoryChoiceField(forms.ModelChoiceField):
+    """
+    ModelChoiceField backed by events.categories.
+
+    Rendering the <select> and turning the submitted id back into a
+    Category both use the registry, so neither queries the database.
+    """
+
+    iterator = CategoryChoiceIterator
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        try:
+            category = get_category(int(value))
+        except _ID_ERRORS:
+            category = None
+        if category is None:
+            raise ValidationError(self.error_messages["invalid_choice"], code="invalid_choice", params={"value": value})
+        return category
+
 
 class EventForm(forms.ModelForm):
     class Meta:
@@ -14,8 +58,12 @@ class EventForm(forms.ModelForm):
             "date_time",
             "location",
             "price",
+            "capacity",
             "category",
         ]
+        field_classes = {
+            "category": CategoryChoiceField,
+        }
         widgets = {
             "date_time": forms.DateTimeInput(
                 attrs={"type": "datetime-local"},
@@ -30,3 +78,11 @@ class EventForm(forms.ModelForm):
         # Add Bootstrap classes to all fields
         for field in self.fields.values():
             field.widget.attrs.setdefault("class", "form-control")
+
+    def clean_capacity(self):
+        capacity = self.cleaned_data.get("capacity")
+        if capacity is not None and self.instance.pk and capacity < self.instance.attendee_count:
+            raise forms.ValidationError(
+                f"{self.instance.attendee_count} people are already attending; capacity can't be lower."
+            )
+        return capacity
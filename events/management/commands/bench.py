@@ -0,0 +1,233 @@
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from io import StringIO
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from accounts.backends import forget_user
+from accounts.models import User
+from events.cache import get_cache
+from events.categories import clear_categories
+from events.models import Event
+
+# Hot paths, each driven in-process through the test client:
+#     name -> (method, URL builder, log in first, clear caches before every request)
+# Cold list requests go through the full query path; the cached ones show
+# what a repeat visitor costs.
+SCENARIOS = {
+    "event_list": ("get", lambda event: reverse("events:event_list") + "?sort=attendees&dir=desc", False, True),
+    "event_list_cached": ("get", lambda event: reverse("events:event_list"), False, False),
+    "event_detail": ("get", lambda event: reverse("events:event_detail", args=[event]), True, False),
+    "rsvp": ("post", lambda event: reverse("events:event_rsvp", args=[event]), True, False),
+    "api_event_list": ("get", lambda event: reverse("event-list"), False, True),
+    "api_event_detail": ("get", lambda event: reverse("event-detail", args=[event]), False, False),
+    "api_event_rsvps": ("get", lambda event: reverse("event-rsvps", args=[event]), False, False),
+}
+
+# Compared against --baseline; memory and latency get --threshold slack,
+# query counts are deterministic and get none.
+COMPARED = ("p95_ms", "queries", "peak_kib")
+
+
+class Command(BaseCommand):
+    help = "Benchmark the event pages, RSVP writes and API endpoints against generated datasets"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=[1_000, 10_000],
+            help="Events per dataset (default: 1000 10000); users = events / 5, 20 RSVPs per event on average",
+        )
+        parser.add_argument(
+            "--scenarios",
+            nargs="+",
+            choices=list(SCENARIOS),
+            default=list(SCENARIOS),
+            help="Scenarios to run (default: all)",
+        )
+        parser.add_argument("--requests", type=int, default=200, help="Timed requests per scenario (default: 200)")
+        parser.add_argument("--warmup", type=int, default=10, help="Untimed requests first (default: 10)")
+        parser.add_argument("--seed", type=int, default=1, help="generate_data seed (default: 1)")
+        parser.add_argument("--json", dest="json_path", help="Write the results here as JSON")
+        parser.add_argument("--baseline", help="JSON from an earlier run; fail if anything regressed")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.2,
+            help="Allowed slowdown / memory growth against --baseline, as a fraction (default: 0.2)",
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options["baseline"]:
+            try:
+                baseline = json.loads(Path(options["baseline"]).read_text())
+            except (OSError, ValueError) as error:
+                raise CommandError(f"Can't read baseline {options['baseline']}: {error}")
+
+        results = {}
+        # The test client's host
+        with override_settings(ALLOWED_HOSTS=["testserver"]):
+            for size in options["sizes"]:
+                results[str(size)] = self.bench_size(size, options)
+
+        report = {"meta": self.meta(options), "results": results}
+        if options["json_path"]:
+            Path(options["json_path"]).write_text(json.dumps(report, indent=2) + "\n")
+            self.stdout.write(f"Wrote {options['json_path']}")
+
+        if baseline is not None:
+            regressions = self.regressions(baseline.get("results", {}), results, options["threshold"])
+            if regressions:
+                for line in regressions:
+                    self.stdout.write(self.style.ERROR(f"  {line}"))
+                raise CommandError(f"{len(regressions)} regression(s) against {options['baseline']}")
+            self.stdout.write(self.style.SUCCESS(f"No regressions against {options['baseline']}."))
+
+    def bench_size(self, size, options):
+        """Generate a dataset of ``size`` events, run every scenario, roll it all back."""
+        results = {}
+        with transaction.atomic():
+            # Everything below, dataset included, is rolled back at the end:
+            # the database is left as it was.
+            self.reset_caches()
+            call_command(
+                "generate_data",
+                users=max(size // 5, 10),
+                events=size,
+                rsvps_per_event=20,
+                seed=options["seed"],
+                prefix="bench",
+                verbosity=0,
+                stdout=StringIO(),
+            )
+            # Detail and write scenarios cycle through these: open, with room
+            event_ids = list(
+                Event.objects.filter(creator__username__startswith="bench", status=Event.Status.ACTIVE)
+                .filter(Q(capacity__isnull=True) | Q(capacity__gt=F("attendee_count")))
+                .order_by("pk")
+                .values_list("pk", flat=True)[:1000]
+            )
+            user = User.objects.create_user(username="bench-client", password="unused")
+
+            self.stdout.write(f"\n{size:,} events")
+            self.stdout.write(
+                f"  {'scenario':<20} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8} {'peak KiB':>9}"
+            )
+            for name in options["scenarios"]:
+                result = self.bench_scenario(name, event_ids, user, options["requests"], options["warmup"])
+                results[name] = result
+                self.stdout.write(
+                    f"  {name:<20} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f}"
+                    f" {result['queries']:>8.1f} {result['peak_kib']:>9,.0f}"
+                )
+            transaction.set_rollback(True)
+        self.reset_caches()
+        return results
+
+    def bench_scenario(self, name, event_ids, user, requests, warmup):
+        method, url, login, cold = SCENARIOS[name]
+        client = Client()
+        if login:
+            client.force_login(user)
+        self.reset_caches()
+        urls = [url(event_ids[i % len(event_ids)]) for i in range(warmup + requests)]
+
+        def fetch(i):
+            if cold:
+                get_cache().clear()
+            response = getattr(client, method)(urls[i])
+            if response.status_code >= 400:
+                raise CommandError(f"{name}: {method.upper()} {urls[i]} returned {response.status_code}")
+
+        for i in range(warmup):
+            fetch(i)
+
+        latencies, queries = [], 0
+        for i in range(warmup, warmup + requests):
+            with CaptureQueriesContext(connection) as captured:
+                began = time.perf_counter()
+                fetch(i)
+                latencies.append(time.perf_counter() - began)
+            queries += len(captured)
+
+        # Separate pass: tracemalloc slows everything down, so it never
+        # overlaps the timed requests. Peak is the worst single request.
+        peak = 0
+        tracemalloc.start()
+        try:
+            for i in range(warmup, warmup + min(requests, 20)):
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                fetch(i)
+                peak = max(peak, tracemalloc.get_traced_memory()[1] - before)
+        finally:
+            tracemalloc.stop()
+
+        cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+        return {
+            "p50_ms": round(cuts[49] * 1000, 3),
+            "p95_ms": round(cuts[94] * 1000, 3),
+            "p99_ms": round(cuts[98] * 1000, 3),
+            "queries": round(queries / requests, 2),
+            "peak_kib": round(peak / 1024, 1),
+            "requests": requests,
+        }
+
+    def reset_caches(self):
+        for cache in caches.all():
+            cache.clear()
+        clear_categories()
+        forget_user()
+
+    def regressions(self, baseline, results, threshold):
+        """One line per metric that got worse than baseline allows."""
+        found = []
+        for size, scenarios in results.items():
+            for name, result in scenarios.items():
+                before = baseline.get(size, {}).get(name)
+                if before is None:
+                    continue
+                for metric in COMPARED:
+                    if metric not in before:
+                        continue
+                    slack = 0 if metric == "queries" else threshold
+                    if result[metric] > before[metric] * (1 + slack):
+                        found.append(f"{size} events, {name}: {metric} {before[metric]} -> {result[metric]}")
+        return found
+
+    def meta(self, options):
+        try:
+            git = subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=settings.BASE_DIR,
+                capture_output=True,
+                text=True,
+            )
+        except OSError:  # No git
+            git = None
+        commit = git.stdout.strip() if git is not None and git.returncode == 0 else None
+        return {
+            "commit": commit,
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "requests": options["requests"],
+            "seed": options["seed"],
+        }
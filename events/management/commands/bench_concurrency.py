@@ -0,0 +1,115 @@
+import asyncio
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from events.models import Event
+
+
+class Command(BaseCommand):
+    help = "Compare the event pages under the WSGI and ASGI handlers with many concurrent connections"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--connections",
+            type=int,
+            default=500,
+            help="Concurrent clients, each sending requests back to back (default: 500)",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=5_000,
+            help="Total requests per handler (default: 5000)",
+        )
+        parser.add_argument(
+            "--paths",
+            nargs="+",
+            help="URLs to cycle through (default: the event list and the first event's detail page)",
+        )
+
+    def handle(self, *args, **options):
+        paths = options["paths"] or self.default_paths()
+        clients = options["connections"]
+        per_client = max(1, options["requests"] // clients)
+
+        # In-process handlers, no sockets: this measures how each handler
+        # shares out the Python and database work, not the network.
+        # WSGI serves one request per thread, so it gets a thread per
+        # connection (as a threaded WSGI server would need for the same
+        # concurrency); ASGI serves every connection from the event loop.
+        self.stdout.write(
+            f"Database: {connections['default'].vendor}; {clients} connections x {per_client} requests "
+            f"over {len(paths)} path(s)"
+        )
+        self.stdout.write(f"{'handler':<8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'threads':>8}")
+        for name, run in (("WSGI", self.run_wsgi), ("ASGI", self.run_asgi)):
+            with override_settings(ALLOWED_HOSTS=["testserver"]):  # The test clients' host
+                latencies, errors, elapsed, threads = run(paths, clients, per_client)
+            if errors:
+                raise CommandError(f"{name}: {errors} responses were not 200")
+            self.stdout.write(
+                f"{name:<8} {len(latencies) / elapsed:>8,.0f} {self.percentile(latencies, 50):>8.1f}"
+                f" {self.percentile(latencies, 95):>8.1f} {self.percentile(latencies, 99):>8.1f} {threads:>8}"
+            )
+
+    def default_paths(self):
+        event = Event.objects.order_by("pk").only("pk").first()
+        if event is None:
+            raise CommandError("No events found. Run seed_test_data first.")
+        return [reverse("events:event_list"), reverse("events:event_detail", args=[event.pk])]
+
+    def run_wsgi(self, paths, clients, per_client):
+        latencies, errors, peak = [], [], [threading.active_count()]
+        start = threading.Barrier(clients + 1)
+
+        def connection(offset):
+            client = Client()
+            start.wait()
+            for i in range(per_client):
+                began = time.perf_counter()
+                response = client.get(paths[(offset + i) % len(paths)])
+                latencies.append(time.perf_counter() - began)
+                if response.status_code != 200:
+                    errors.append(response.status_code)
+            peak.append(threading.active_count())
+            connections.close_all()
+
+        threads = [threading.Thread(target=connection, args=(n,)) for n in range(clients)]
+        for thread in threads:
+            thread.start()
+        start.wait()
+        began = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        return latencies, len(errors), time.perf_counter() - began, max(peak)
+
+    def run_asgi(self, paths, clients, per_client):
+        latencies, errors, peak = [], [], [threading.active_count()]
+
+        async def connection(offset):
+            client = AsyncClient()
+            for i in range(per_client):
+                began = time.perf_counter()
+                response = await client.get(paths[(offset + i) % len(paths)])
+                latencies.append(time.perf_counter() - began)
+                if response.status_code != 200:
+                    errors.append(response.status_code)
+            peak.append(threading.active_count())
+
+        async def main():
+            began = time.perf_counter()
+            await asyncio.gather(*(connection(n) for n in range(clients)))
+            return time.perf_counter() - began
+
+        elapsed = asyncio.run(main())
+        return latencies, len(errors), elapsed, max(peak)
+
+    def percentile(self, latencies, percent):
+        return statistics.quantiles(latencies, n=100)[percent - 1] * 1000
@@ -0,0 +1,102 @@
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.template import Context, Template
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from accounts.models import User
+from events.cache import card_cache_key
+from events.categories import all_categories
+from events.models import Event
+
+# Rendered the old way: every card formatted on every request
+UNCACHED = Template('{% for event in events %}{% include "events/_event_card.html" %}{% endfor %}')
+CACHED = Template("{% load event_tags %}{% event_cards events %}")
+
+
+class Command(BaseCommand):
+    help = "Benchmark event card rendering: uncached vs cold vs warm fragment cache"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=[100, 1_000, 10_000],
+            help="Card counts to render (default: 100 1000 10000)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Runs per measurement; the fastest is reported (default: 3)",
+        )
+
+    def handle(self, *args, **options):
+        # Unsaved, in-memory events: this measures rendering, not the database.
+        # Category names come from the registry, so load it up front.
+        categories = list(all_categories())
+        if not categories:
+            self.stdout.write(self.style.ERROR("No categories found. Run migrate first."))
+            return
+        creators = [User(pk=i, username=f"host{i}") for i in range(1, 50)]
+        now = timezone.now()
+
+        # A private cache big enough that the largest run never evicts (the
+        # project cache holds 5,000 entries; a warm pass must be all hits)
+        bench_cache = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "bench-event-cards",
+                "OPTIONS": {"MAX_ENTRIES": max(options["sizes"]) * 2},
+            }
+        }
+
+        self.stdout.write(
+            f"{'cards':>8} {'uncached ms':>12} {'cold ms':>10} {'warm ms':>10} {'speedup':>8} {'warm hits':>10}"
+        )
+        with override_settings(CACHES=bench_cache, EVENT_LIST_CACHE={"ALIAS": "default"}):
+            for size in options["sizes"]:
+                events = [
+                    Event(
+                        pk=i,
+                        title=f"Event {i}",
+                        description="",
+                        date_time=now + timedelta(hours=i),
+                        location=f"Room {i % 40}",
+                        price=Decimal(i % 7 * 5),
+                        category=categories[i % len(categories)],
+                        creator=creators[i % len(creators)],
+                        attendee_count=i % 90,
+                        updated_at=now,
+                    )
+                    for i in range(1, size + 1)
+                ]
+                context = Context({"events": events})
+
+                uncached = self.best_of(options["repeat"], lambda: UNCACHED.render(context))
+                cold = self.best_of(options["repeat"], lambda: CACHED.render(context), before=caches["default"].clear)
+                warm = self.best_of(options["repeat"], lambda: CACHED.render(context))
+                # Evictions would turn the warm pass into a partly cold one
+                hits = len(caches["default"].get_many([card_cache_key(event) for event in events]))
+
+                self.stdout.write(
+                    f"{size:>8} {uncached * 1000:>12.1f} {cold * 1000:>10.1f} {warm * 1000:>10.1f}"
+                    f" {uncached / warm:>7.1f}x {hits / size:>10.0%}"
+                )
+                if hits < size:
+                    raise CommandError(f"Only {hits} of {size} cards were cached; the warm timing is not all hits")
+
+    def best_of(self, repeat, func, before=None):
+        timings = []
+        for _ in range(repeat):
+            if before:
+                before()
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
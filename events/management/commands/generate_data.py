@@ -0,0 +1,268 @@
+import bisect
+import itertools
+import math
+import random
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import User
+from events.cache import bump_generation
+from events.models import RSVP, Category, Event
+
+ADJECTIVES = [
+    "Spring", "Summer", "Autumn", "Winter", "Annual", "Weekly", "Community", "Open", "Downtown", "Late Night",
+    "Family", "Beginner", "Advanced", "Charity", "Student", "Outdoor", "Indie", "Local", "Virtual", "Sunrise",
+]  # fmt: skip
+NOUNS = [
+    "Coding Bootcamp", "Garden Cleanup", "Band Night", "Book Club", "5K Run", "Art Camp", "Tech Meetup",
+    "Networking Mixer", "Yoga Session", "Craft Fair", "Dinner Party", "Film Screening", "Food Truck Festival",
+    "Resume Workshop", "Basketball Tournament", "Jazz Jam", "Hackathon", "Chess Club", "Trivia Night", "Hike",
+]  # fmt: skip
+LOCATIONS = [
+    "Main Hall, Building A",
+    "Community Center, Room 204",
+    "City Park Pavilion",
+    "Downtown Conference Center",
+    "Virtual (Zoom)",
+    "Student Union, Floor 2",
+    "Public Library, Meeting Room B",
+    "Riverside Amphitheater",
+    "Old Town Brewery",
+    "Westside Gym",
+]
+PRICES = [Decimal(price) for price in ("0.00", "5.00", "10.00", "15.00", "20.00", "25.00", "40.00", "75.00")]
+# Free events are the most common, as on the real site
+PRICE_WEIGHTS = [40, 8, 12, 10, 10, 8, 7, 5]
+
+
+def zipf_weights(n, exponent, rng):
+    """Popularity weight per item: 1 / rank**exponent, ranks dealt out at random."""
+    ranks = list(range(1, n + 1))
+    rng.shuffle(ranks)
+    return [1 / rank**exponent for rank in ranks]
+
+
+def apportion(total, weights, cap, rng):
+    """Split total into whole counts proportional to weights, none above cap.
+
+    Items whose share would pass cap are clipped to it and their excess is
+    shared out over the rest, so the counts add up to total whenever
+    total <= cap * len(weights). Fractional shares are rounded up or down
+    at random (systematic sampling: one draw, each item rounded up with
+    probability equal to its fraction), which keeps the sum exact.
+    """
+    counts = [0] * len(weights)
+    uncapped = list(range(len(weights)))
+    remaining = min(total, cap * len(weights))
+    while uncapped:
+        scale = remaining / sum(weights[i] for i in uncapped)
+        clipped = [i for i in uncapped if weights[i] * scale >= cap]
+        if not clipped:
+            break
+        for i in clipped:
+            counts[i] = cap
+        remaining -= cap * len(clipped)
+        uncapped = [i for i in uncapped if weights[i] * scale < cap]
+    if not uncapped:
+        return counts
+
+    offset = rng.random()
+    cumulative = 0.0
+    for i in uncapped:
+        before = math.floor(cumulative + offset)
+        cumulative += weights[i] * scale
+        counts[i] = math.floor(cumulative + offset) - before
+    # The shares add up to remaining; end on it exactly despite float drift
+    counts[uncapped[-1]] += math.floor(remaining + offset) - math.floor(cumulative + offset)
+    return counts
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let bulk_create() keep the auto_now/auto_now_add values set on each object."""
+    fields = [
+        field
+        for model in models
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+    flags = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in flags:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = "Generate a large, reproducible dataset of users, events and RSVPs for load tests and benchmarks"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10_000, help="Users to create (default: 10000)")
+        parser.add_argument("--events", type=int, default=50_000, help="Events to create (default: 50000)")
+        parser.add_argument(
+            "--rsvps-per-event",
+            type=float,
+            default=20,
+            help="Mean RSVPs per event (default: 20); no event gets more than --users",
+        )
+        parser.add_argument(
+            "--skew",
+            type=float,
+            default=1.1,
+            help="Zipf exponent of event popularity and creator activity; 0 = uniform (default: 1.1)",
+        )
+        parser.add_argument("--seed", type=int, default=1, help="Random seed; same seed, same data (default: 1)")
+        parser.add_argument(
+            "--prefix",
+            default="load",
+            help='Username prefix, e.g. "load" -> load0000001 (default: load)',
+        )
+        parser.add_argument(
+            "--password",
+            default="LoadTest123!",
+            help="Password of every generated user, hashed once (default: LoadTest123!)",
+        )
+        parser.add_argument(
+            "--start",
+            default="2026-01-01",
+            help="First event date, YYYY-MM-DD; events spread over the following year (default: 2026-01-01)",
+        )
+        parser.add_argument("--batch-size", type=int, default=5_000, help="Rows per INSERT batch (default: 5000)")
+
+    def handle(self, *args, **options):
+        self.verbosity = options["verbosity"]
+        users, events, batch_size = options["users"], options["events"], options["batch_size"]
+        if users < 1 or events < 0 or batch_size < 1 or options["rsvps_per_event"] < 0:
+            raise CommandError("--users and --batch-size must be positive; --events and --rsvps-per-event not negative")
+        try:
+            start = timezone.make_aware(datetime.strptime(options["start"], "%Y-%m-%d"))
+        except ValueError:
+            raise CommandError(f"--start must be YYYY-MM-DD, got {options['start']!r}")
+
+        prefix = options["prefix"]
+        if User.objects.filter(username__startswith=prefix).exists():
+            raise CommandError(f'Users named "{prefix}..." already exist. Pick another --prefix or delete them.')
+        categories = list(Category.objects.order_by("pk"))
+        if not categories:
+            raise CommandError("No categories found. Run migrate first.")
+
+        # One stream for everything, consumed in a fixed order: the same
+        # options always produce the same rows.
+        rng = random.Random(options["seed"])
+        began = time.perf_counter()
+
+        user_ids = self.create_users(rng, users, prefix, options["password"], start, batch_size)
+
+        # Decide every event's attendance up front: a few events draw huge
+        # crowds, most draw a handful. The total matches the requested mean
+        # unless there are too few users to go round.
+        popularity = zipf_weights(events, options["skew"], rng)
+        attendance = apportion(round(options["rsvps_per_event"] * events), popularity, users, rng)
+
+        # A few prolific hosts create most events
+        creator_weights = list(itertools.accumulate(zipf_weights(users, options["skew"], rng)))
+
+        rsvps = self.create_events(rng, start, categories, user_ids, creator_weights, attendance, batch_size)
+
+        bump_generation()  # bulk_create skips the signals that would have done this
+        elapsed = time.perf_counter() - began
+        total = users + events + rsvps
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done! {users:,} users, {events:,} events, {rsvps:,} RSVPs "
+                f"in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)."
+            )
+        )
+
+    def create_users(self, rng, count, prefix, password, joined, batch_size):
+        # Hashing is deliberately slow (~100 ms); do it once for everyone.
+        # The salt comes from the seed so the hash is reproducible too.
+        hashed = make_password(password, salt=f"{rng.getrandbits(64):016x}")
+        user_ids = []
+        for offset in range(0, count, batch_size):
+            batch = [
+                User(
+                    username=f"{prefix}{i:07d}",
+                    email=f"{prefix}{i:07d}@example.com",
+                    password=hashed,
+                    date_joined=joined,
+                )
+                for i in range(offset + 1, min(offset + batch_size, count) + 1)
+            ]
+            with transaction.atomic():
+                user_ids.extend(user.pk for user in User.objects.bulk_create(batch))
+            self.progress("users", len(user_ids), count)
+        return user_ids
+
+    def create_events(self, rng, start, categories, user_ids, creator_weights, attendance, batch_size):
+        total_events, total_rsvps = len(attendance), sum(attendance)
+        span = 365 * 24 * 60  # Minutes
+        events_done = rsvps_done = 0
+
+        for offset in range(0, total_events, batch_size):
+            counts = attendance[offset : offset + batch_size]
+            batch, replies = [], []
+            for i, attending in enumerate(counts, start=offset + 1):
+                capacity = None
+                if rng.random() < 0.2:
+                    # Capped events: some full, most with room left
+                    capacity = attending + rng.choice((0, 0, 5, 10, 25, 50))
+                creator = user_ids[bisect.bisect_left(creator_weights, rng.random() * creator_weights[-1])]
+                # Timestamps come from the stream too (auto_now would stamp
+                # the wall clock): listed between --start and the event
+                # itself, RSVPs arriving in between.
+                happens = rng.randrange(span)
+                listed = rng.randrange(happens + 1)
+                rsvp_times = [listed + rng.randrange(happens - listed + 1) for _ in range(attending)]
+                replies.append(zip(rng.sample(user_ids, attending), rsvp_times))
+                batch.append(
+                    Event(
+                        title=f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} #{i}",
+                        description=f"Generated event {i}.",
+                        date_time=start + timedelta(minutes=happens),
+                        location=rng.choice(LOCATIONS),
+                        price=rng.choices(PRICES, PRICE_WEIGHTS)[0],
+                        category=categories[rng.randrange(len(categories))],
+                        creator_id=creator,
+                        status=Event.Status.CANCELLED if rng.random() < 0.05 else Event.Status.ACTIVE,
+                        attendee_count=attending,  # Exact: the RSVPs below are created to match
+                        capacity=capacity,
+                        created_at=start + timedelta(minutes=listed),
+                        # RSVPs touch their event (events/signals.py)
+                        updated_at=start + timedelta(minutes=max(rsvp_times, default=listed)),
+                    )
+                )
+
+            with transaction.atomic(), explicit_timestamps(Event, RSVP):
+                created = Event.objects.bulk_create(batch)
+                rsvp_batch = []
+                for event, event_replies in zip(created, replies):
+                    rsvp_batch.extend(
+                        RSVP(user_id=user, event_id=event.pk, created_at=start + timedelta(minutes=minute))
+                        for user, minute in event_replies
+                    )
+                    if len(rsvp_batch) >= batch_size:
+                        RSVP.objects.bulk_create(rsvp_batch, batch_size=batch_size)
+                        rsvps_done += len(rsvp_batch)
+                        rsvp_batch = []
+                RSVP.objects.bulk_create(rsvp_batch, batch_size=batch_size)
+                rsvps_done += len(rsvp_batch)
+
+            events_done += len(batch)
+            self.progress("events", events_done, total_events, f", RSVPs {rsvps_done:,}/{total_rsvps:,}")
+        return rsvps_done
+
+    def progress(self, label, done, total, extra=""):
+        if self.verbosity:
+            ending = "\n" if done >= total else "\r"
+            self.stdout.write(f"  {label} {done:,}/{total:,}{extra}", ending=ending)
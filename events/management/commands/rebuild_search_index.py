@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from events.search import rebuild_search_index, search_supported
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index (events_event_fts) from the events table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            default="default",
+            help="Database alias (default: default)",
+        )
+
+    def handle(self, *args, **options):
+        if not search_supported(options["database"]):
+            raise CommandError("The full-text index only exists on SQLite; other databases search without it.")
+        indexed = rebuild_search_index(options["database"])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} events."))
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F
+
+from events.cache import bump_rsvp_generation
+from events.models import Event, actual_attendee_count
+
+
+class Command(BaseCommand):
+    help = "Recompute Event.attendee_count from the RSVP table and repair any drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report events with a wrong count without changing them",
+        )
+
+    def handle(self, *args, **options):
+        # Find only the rows that disagree so a healthy table costs one SELECT
+        stale = Event.objects.annotate(actual=actual_attendee_count()).exclude(attendee_count=F("actual"))
+        stale_rows = list(stale.values_list("pk", "attendee_count", "actual"))
+
+        for pk, stored, actual in stale_rows:
+            self.stdout.write(f"  Event {pk}: stored {stored}, actual {actual}")
+
+        if not stale_rows:
+            self.stdout.write(self.style.SUCCESS("All attendee counts are correct."))
+            return
+
+        if options["dry_run"]:
+            self.stdout.write(self.style.WARNING(f"{len(stale_rows)} events have a wrong count (dry run)."))
+            return
+
+        fixed = Event.objects.filter(pk__in=[pk for pk, _, _ in stale_rows]).refresh_attendee_counts()
+        bump_rsvp_generation()  # .update() skips signals; cached attendee sorts are stale
+        self.stdout.write(self.style.SUCCESS(f"Repaired {fixed} attendee counts."))
@@ -0,0 +1,27 @@
+# Generated by Django 6.0.1 on 2026-10-18 12:29
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_attendee_count(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    RSVP = apps.get_model("events", "RSVP")
+    counts = RSVP.objects.filter(event=OuterRef("pk")).order_by().values("event").annotate(total=Count("pk"))
+    Event.objects.update(attendee_count=Coalesce(Subquery(counts.values("total")), 0))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0002_seed_categories"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="attendee_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_attendee_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 6.0.1 on 2026-10-18 14:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0004_event_list_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(fields=["updated_at"], name="event_updated_idx"),
+        ),
+    ]
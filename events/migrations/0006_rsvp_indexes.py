@@ -0,0 +1,43 @@
+# Generated by Django 6.0.1 on 2026-10-18 15:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0005_event_updated_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="rsvp",
+            name="event",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="rsvps",
+                to="events.event",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="rsvp",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="rsvps",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rsvp",
+            index=models.Index(fields=["event", "created_at", "id"], name="rsvp_event_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="rsvp",
+            index=models.Index(fields=["user", "created_at", "id"], name="rsvp_user_created_idx"),
+        ),
+    ]
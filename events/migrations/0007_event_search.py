@@ -0,0 +1,76 @@
+# Generated by Django 6.0.1 on 2026-10-18 16:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+import events.models
+from events.search import TRIGGER_SQL
+
+# FTS5 index over events. SQLite only: on other databases search falls
+# back to icontains (EventQuerySet.search) and these are skipped.
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE events_event_fts USING fts5(
+        title, description, location, category,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """,
+    # Triggers that keep the index in step with events_event. They are also
+    # dropped before and recreated after every migrate (events/search.py).
+    *TRIGGER_SQL.values(),
+    # Index the events that already exist
+    """
+    INSERT INTO events_event_fts (rowid, title, description, location, category)
+    SELECT e.id, e.title, e.description, e.location, c.name
+    FROM events_event e JOIN events_category c ON c.id = e.category_id
+    """,
+]
+
+DROP_SQL = [
+    *(f"DROP TRIGGER IF EXISTS {name}" for name in TRIGGER_SQL),
+    "DROP TABLE IF EXISTS events_event_fts",
+]
+
+
+def run_on_sqlite(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != "sqlite":
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+
+    return run
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0006_rsvp_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(run_on_sqlite(CREATE_SQL), run_on_sqlite(DROP_SQL)),
+        migrations.CreateModel(
+            name="EventSearch",
+            fields=[
+                (
+                    "event",
+                    models.OneToOneField(
+                        db_column="rowid",
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="search",
+                        serialize=False,
+                        to="events.event",
+                    ),
+                ),
+                ("document", events.models.FullTextField(db_column="events_event_fts")),
+                ("rank", models.FloatField()),
+            ],
+            options={
+                "db_table": "events_event_fts",
+                "managed": False,
+            },
+        ),
+    ]
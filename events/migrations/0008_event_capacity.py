@@ -0,0 +1,21 @@
+# Generated by Django 6.0.1 on 2026-10-18 17:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0007_event_search"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="capacity",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text="Maximum attendees. Leave empty for no limit.",
+                null=True,
+            ),
+        ),
+    ]
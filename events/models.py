@@ -1,7 +1,12 @@
 from decimal import Decimal
 
 from django.conf import settings
-from django.db import models
+from django.db import connections, models
+from django.db.models import Count, Exists, F, FloatField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .search import fts_query, search_terms
 
 
 class Category(models.Model):
@@ -28,6 +33,72 @@ class Category(models.Model):
         return self.name
 
 
+class EventQuerySet(models.QuerySet):
+    """
+    Reusable query building blocks for events.
+
+    Examples:
+        Event.objects.filter(pk__in=ids).refresh_attendee_counts()
+        Event.objects.for_detail(request.user).get(pk=pk)
+        Event.objects.search("jazz").order_by("search_rank")
+    """
+
+    def with_rsvp_state(self, user):
+        """Annotate ``has_rsvped``: whether ``user`` RSVPed (always False when anonymous)."""
+        if user is None or not user.is_authenticated:
+            return self.annotate(has_rsvped=Value(False))
+        return self.annotate(has_rsvped=Exists(RSVP.objects.filter(event=OuterRef("pk"), user=user)))
+
+    def for_detail(self, user):
+        """
+        Everything the detail page needs in one SELECT: the event, its
+        creator (joined), the stored attendee_count, and has_rsvped for the
+        current user (EXISTS subquery). The category name comes from the
+        registry (events/categories.py), so it isn't joined.
+        """
+        return self.select_related("creator").with_rsvp_state(user)
+
+    def search(self, text):
+        """
+        Events matching every word of ``text`` (as prefixes), annotated with
+        ``search_rank``: the bm25 score, lower is better. See events/search.py.
+
+        Input with no words leaves the queryset unfiltered (rank 0).
+        """
+        query = fts_query(text)
+        if not query:
+            return self.annotate(search_rank=Value(0.0, output_field=FloatField()))
+        if connections[self.db].vendor != "sqlite":
+            # No FTS5 table on this database: same matches, unranked, scanning
+            condition = Q()
+            for term in search_terms(text):
+                condition &= (
+                    Q(title__icontains=term)
+                    | Q(description__icontains=term)
+                    | Q(location__icontains=term)
+                    | Q(category__name__icontains=term)
+                )
+            return self.filter(condition).annotate(search_rank=Value(0.0, output_field=FloatField()))
+        return self.filter(search__document__match=query).annotate(search_rank=F("search__rank"))
+
+    def refresh_attendee_counts(self):
+        """
+        Recompute attendee_count from the RSVP table for every event in
+        this queryset. One UPDATE with a correlated COUNT subquery; touches
+        updated_at like any other RSVP change.
+
+        Used to repair drift and after bulk writes that skip signals.
+        Returns the number of rows updated.
+        """
+        return self.update(attendee_count=actual_attendee_count(), updated_at=timezone.now())
+
+
+def actual_attendee_count():
+    """Subquery expression: the real number of RSVP rows for OuterRef("pk")."""
+    counts = RSVP.objects.filter(event=OuterRef("pk")).order_by().values("event").annotate(total=Count("pk"))
+    return Coalesce(Subquery(counts.values("total")), 0)
+
+
 class Event(models.Model):
     """
     Core event model.
@@ -39,14 +110,15 @@ class Event(models.Model):
         event.creator           -> User who created the event
         event.category          -> Category this event belongs to
         event.rsvps.all()       -> All RSVPs for this event
-        event.rsvps.count()     -> Attendee count
+        event.attendee_count    -> Attendee count (stored, no query)
+        event.capacity          -> Attendance cap, or None for unlimited
         user.created_events.all() -> All events a user created
 
     Status flow:
         active -> cancelled     (creator cancels, event stays visible)
         active -> draft         (future: save without publishing)
 
-    Query patterns:
+    Query patterns (each one served by an index in Meta.indexes):
         Event.objects.filter(status='active').order_by('date_time')
         Event.objects.filter(category__name='Workshop')
         Event.objects.filter(price__lte=Decimal('50.00'))
@@ -73,15 +145,19 @@ class Event(models.Model):
     )
 
     # Relationships
+    # No standalone FK indexes: the (category, date_time) and
+    # (creator, date_time) indexes in Meta already lead with these columns.
     category = models.ForeignKey(
         Category,
         on_delete=models.PROTECT,  # Prevent deleting categories that have events
         related_name="events",
+        db_index=False,
     )
     creator = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,  # Delete user -> delete their events
         related_name="created_events",
+        db_index=False,
     )
 
     # Status
@@ -91,17 +167,107 @@ class Event(models.Model):
         default=Status.ACTIVE,
     )
 
+    # Denormalized RSVP count so list sorting and display never touch
+    # the RSVP table. Kept exact by the RSVP signals in events/signals.py;
+    # `manage.py recount_attendees` repairs any drift.
+    attendee_count = models.PositiveIntegerField(default=0, editable=False)
+    # Optional attendance cap, enforced by events/services.py in the same
+    # UPDATE that counts the RSVP.
+    capacity = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Maximum attendees. Leave empty for no limit.",
+    )
+
     # Audit timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = EventQuerySet.as_manager()
+
     class Meta:
         db_table = "events_event"
         ordering = ["date_time"]  # Default sort: soonest first
+        # One index per real access path of the event list. Sort indexes end
+        # in id because keyset pagination orders by (sort field, pk).
+        indexes = [
+            # Filters, soonest first
+            models.Index(fields=["status", "date_time"], name="event_status_date_idx"),
+            models.Index(fields=["category", "date_time"], name="event_category_date_idx"),
+            models.Index(fields=["creator", "date_time"], name="event_creator_date_idx"),
+            # Date range filter + the sort buttons
+            models.Index(fields=["date_time", "id"], name="event_date_idx"),
+            models.Index(fields=["price", "id"], name="event_price_idx"),
+            models.Index(fields=["location", "id"], name="event_location_idx"),
+            models.Index(fields=["attendee_count", "id"], name="event_attendee_count_idx"),
+            # MAX(updated_at) fingerprint for API ETag / Last-Modified
+            models.Index(fields=["updated_at"], name="event_updated_idx"),
+        ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        # attendee_count only ever changes through F() updates (signals and
+        # events/services.py). A full save() of an instance loaded earlier
+        # would write back its stale copy, so plain updates leave it out.
+        if not self._state.adding and kwargs.get("update_fields") is None and not kwargs.get("force_insert"):
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "attendee_count"
+            ]
+        super().save(*args, **kwargs)
+
+    @property
+    def is_full(self):
+        return self.capacity is not None and self.attendee_count >= self.capacity
+
+
+class FullTextField(models.TextField):
+    """A column of an FTS5 table. Supports the ``match`` lookup."""
+
+
+@FullTextField.register_lookup
+class Match(models.Lookup):
+    """``field__match="..."`` -> ``field MATCH '...'``"""
+
+    lookup_name = "match"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", [*lhs_params, *rhs_params]
+
+
+class EventSearch(models.Model):
+    """
+    Read-only view of the events_event_fts FTS5 table (see events/search.py).
+
+    Not managed by Django: migration 0007_event_search creates the table
+    and the triggers that fill it. Joined to Event by rowid = event id, so
+    Event.objects.search() is a single query.
+
+        document  FTS5's hidden column named after the table; MATCH it to
+                  search every indexed column
+        rank      FTS5's hidden bm25 score for the current MATCH
+    """
+
+    event = models.OneToOneField(
+        Event,
+        on_delete=models.DO_NOTHING,  # Triggers remove the row
+        primary_key=True,
+        db_column="rowid",
+        db_constraint=False,
+        related_name="search",
+    )
+    document = FullTextField(db_column="events_event_fts")
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = "events_event_fts"
+
 
 class RSVP(models.Model):
     """
@@ -114,28 +280,41 @@ class RSVP(models.Model):
     database level — same concept as a composite primary key on a
     junction table in SQL Server.
 
+    Creating or deleting an RSVP (including cascades from deleting a user)
+    adjusts Event.attendee_count through signals — see events/signals.py.
+
     Key query patterns:
-        event.rsvps.count()                          # Attendee count
+        event.attendee_count                         # Attendee count
         event.rsvps.select_related('user').all()     # Attendee list
         RSVP.objects.filter(user=user, event=event)  # Check if user RSVPed
         user.rsvps.select_related('event').all()     # User's RSVPed events
     """
 
+    # No standalone FK indexes: the composite indexes in Meta lead with
+    # these columns.
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,  # Delete user -> delete their RSVPs
         related_name="rsvps",
+        db_index=False,
     )
     event = models.ForeignKey(
         Event,
         on_delete=models.CASCADE,  # Delete event -> delete its RSVPs
         related_name="rsvps",
+        db_index=False,
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         db_table = "events_rsvp"
         unique_together = ["user", "event"]  # One RSVP per user per event
+        # Both directions of the API, newest first (api.pagination.RSVPCursorPagination).
+        # The unique (user, event) index can't serve "attendees of event X".
+        indexes = [
+            models.Index(fields=["event", "created_at", "id"], name="rsvp_event_created_idx"),
+            models.Index(fields=["user", "created_at", "id"], name="rsvp_user_created_idx"),
+        ]
         verbose_name = "RSVP"
         verbose_name_plural = "RSVPs"
 
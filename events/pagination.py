@@ -0,0 +1,228 @@
+import base64
+import binascii
+import datetime
+import json
+import math
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from django.db.models.fields.tuple_lookups import Tuple, TupleGreaterThan, TupleLessThan
+
+from .filters import MAX_ID
+
+DEFAULT_PAGE_SIZE = 24
+
+# What decoding a tampered or stale cursor can raise
+_CURSOR_ERRORS = (binascii.Error, UnicodeDecodeError, ValueError, TypeError, OverflowError, ValidationError)
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """
+    DjangoJSONEncoder trims datetimes to milliseconds. A cursor must keep
+    the full microsecond value or rows near the page boundary get repeated.
+    """
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class KeysetPage:
+    """
+    One page of results from a KeysetPaginator.
+
+    Unlike Django's Paginator, there is no page number or total count.
+    Navigation happens through opaque cursors that encode the sort key
+    of the first/last row on the page.
+
+    Usage in templates:
+        {% for event in page %}...{% endfor %}
+        {% if page.has_next %}<a href="?after={{ page.next_cursor }}">Next</a>{% endif %}
+    """
+
+    # Total matching rows, when known for free (e.g. from a cached result)
+    count = None
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.has_next = has_next
+        self.has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    @property
+    def next_cursor(self):
+        if not self.has_next:
+            return ""
+        return self.paginator.encode_cursor(self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous:
+            return ""
+        return self.paginator.encode_cursor(self.object_list[0])
+
+
+class KeysetPaginator:
+    """
+    Cursor (keyset / "seek") pagination over an ordered queryset.
+
+    Why not Django's Paginator?
+    - Paginator uses LIMIT/OFFSET, so page N makes the database walk and
+      throw away N * page_size rows first. Deep pages get slower and slower.
+    - Keyset pagination remembers the sort key of the last row we showed
+      and asks for "rows after this key" instead. With an index on the
+      sort column every page costs the same as page 1.
+
+    The sort field is always paired with the primary key as a tie-breaker,
+    so rows with equal sort values (same price, same date) are never
+    skipped or repeated between pages.
+
+    Example:
+        paginator = KeysetPaginator(events, field="price", descending=True)
+        page = paginator.page(after=request.GET.get("after"))
+    """
+
+    def __init__(self, queryset, field, descending=False, page_size=DEFAULT_PAGE_SIZE):
+        self.queryset = queryset
+        self.field = field
+        self.descending = descending
+        self.page_size = page_size
+
+    # --- Ordering ---
+
+    @property
+    def ordering(self):
+        prefix = "-" if self.descending else ""
+        return [f"{prefix}{self.field}", f"{prefix}pk"]
+
+    @property
+    def reversed_ordering(self):
+        prefix = "" if self.descending else "-"
+        return [f"{prefix}{self.field}", f"{prefix}pk"]
+
+    # --- Cursors ---
+
+    def position(self, obj):
+        """The [sort value, pk] a cursor at ``obj`` remembers."""
+        return [getattr(obj, self.field), obj.pk]
+
+    def encode_cursor(self, obj):
+        """Turn the sort key of ``obj`` into an opaque, URL-safe token."""
+        raw = json.dumps(self.position(obj), cls=CursorEncoder, separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        """
+        Turn a token back into a (value, pk) tuple.
+
+        Returns None for anything we can't parse — a tampered or stale
+        cursor just sends the user back to the first page.
+        """
+        if not cursor:
+            return None
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            value, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return self._to_python(value), self._to_int(pk)
+        except _CURSOR_ERRORS:
+            return None
+
+    def _to_python(self, value):
+        # Real columns know how to parse their own JSON form (ISO dates,
+        # decimal strings). Annotations such as a rank are plain JSON numbers.
+        if self.field == "pk":
+            return self._to_int(value)
+        try:
+            field = self.queryset.model._meta.get_field(self.field)
+        except FieldDoesNotExist:
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+                raise ValueError(f"Not a finite number: {value!r}")
+            return float(value)
+        value = field.to_python(value)
+        return self._to_int(value) if isinstance(value, int) else value
+
+    def _to_int(self, value):
+        # Anything a 64-bit column can't hold would overflow at query time
+        value = int(value)
+        if abs(value) > MAX_ID:
+            raise ValueError(f"Out of range: {value}")
+        return value
+
+    def _seek(self, position, forward):
+        """
+        Condition selecting rows strictly after (or before) ``position``.
+
+        Written as one row-value comparison, (field, pk) > (value, pk), so
+        the database seeks straight to the cursor in the (field, id) index.
+        The equivalent "field > value OR (field = value AND pk > pk)" makes
+        SQLite walk the index from its start: O(N) again on deep pages.
+        """
+        value, pk = position
+        # Moving "forward" through a descending list means smaller values
+        lookup = TupleLessThan if self.descending == forward else TupleGreaterThan
+        return lookup(Tuple(F(self.field), F("pk")), (value, pk))
+
+    # --- Pages ---
+
+    def page(self, after=None, before=None):
+        """
+        Fetch one page.
+
+        after:  cursor of the last row on the previous page (Next link)
+        before: cursor of the first row on the next page (Previous link)
+
+        Fetches page_size + 1 rows so we know whether another page exists
+        without running a COUNT.
+        """
+        after_position = self.decode_cursor(after)
+        before_position = None if after_position else self.decode_cursor(before)
+
+        if before_position:
+            queryset = self.queryset.filter(self._seek(before_position, forward=False))
+            rows = list(queryset.order_by(*self.reversed_ordering)[: self.page_size + 1])
+            has_previous = len(rows) > self.page_size
+            rows = rows[: self.page_size]
+            rows.reverse()
+            return KeysetPage(rows, self, has_next=True, has_previous=has_previous)
+
+        queryset = self.queryset
+        if after_position:
+            queryset = queryset.filter(self._seek(after_position, forward=True))
+        rows = list(queryset.order_by(*self.ordering)[: self.page_size + 1])
+        has_next = len(rows) > self.page_size
+        return KeysetPage(rows[: self.page_size], self, has_next=has_next, has_previous=bool(after_position))
+
+    async def apage(self, after=None, before=None):
+        """Async version of page(), for async views (same queries)."""
+        after_position = self.decode_cursor(after)
+        before_position = None if after_position else self.decode_cursor(before)
+
+        if before_position:
+            queryset = self.queryset.filter(self._seek(before_position, forward=False))
+            rows = [row async for row in queryset.order_by(*self.reversed_ordering)[: self.page_size + 1]]
+            has_previous = len(rows) > self.page_size
+            rows = rows[: self.page_size]
+            rows.reverse()
+            return KeysetPage(rows, self, has_next=True, has_previous=has_previous)
+
+        queryset = self.queryset
+        if after_position:
+            queryset = queryset.filter(self._seek(after_position, forward=True))
+        rows = [row async for row in queryset.order_by(*self.ordering)[: self.page_size + 1]]
+        has_next = len(rows) > self.page_size
+        return KeysetPage(rows[: self.page_size], self, has_next=has_next, has_previous=bool(after_position))
@@ -0,0 +1,128 @@
+import re
+
+from django.db import connections, transaction
+
+# Full-text search over events, backed by an SQLite FTS5 table.
+#
+# Why FTS5 instead of title__icontains?
+# - icontains is LIKE '%word%': no index can serve it, so every keystroke
+#   scans events_event. FTS5 keeps an inverted index and ranks with bm25.
+# - events_event_fts holds title, description, location and the category
+#   name, keyed by rowid = event id. Triggers (TRIGGER_SQL) keep it in
+#   step with events_event/events_category; `manage.py
+#   rebuild_search_index` rebuilds it from scratch.
+#
+# Why are the triggers dropped around every migrate?
+# - Each trigger on one table reads the other. When a migration makes
+#   SQLite's schema editor rebuild events_event or events_category
+#   (AlterField and friends: copy, drop, rename), the triggers point at a
+#   table that is briefly missing and the migration fails. pre_migrate
+#   drops them, post_migrate creates them again and reindexes whatever
+#   the migrations wrote meanwhile (see events/signals.py).
+#
+# Queries go through EventQuerySet.search(), which joins the table via the
+# unmanaged EventSearch model and annotates search_rank (lower = better).
+#
+# Examples:
+#     Event.objects.search("jazz brunch")       # Every word, as a prefix
+#     fts_query('jazz "brunch')                 # '"jazz"* "brunch"*'
+
+FTS_TABLE = "events_event_fts"
+
+# Keep the index in step with events_event. UPDATE OF lists only the
+# searchable columns so attendee_count bumps never touch the index.
+# IF NOT EXISTS: safe to run any number of times.
+TRIGGER_SQL = {
+    "events_event_fts_insert": f"""
+    CREATE TRIGGER IF NOT EXISTS events_event_fts_insert AFTER INSERT ON events_event BEGIN
+        INSERT INTO {FTS_TABLE} (rowid, title, description, location, category)
+        VALUES (new.id, new.title, new.description, new.location,
+                (SELECT name FROM events_category WHERE id = new.category_id));
+    END
+    """,
+    "events_event_fts_update": f"""
+    CREATE TRIGGER IF NOT EXISTS events_event_fts_update
+    AFTER UPDATE OF title, description, location, category_id ON events_event BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+        INSERT INTO {FTS_TABLE} (rowid, title, description, location, category)
+        VALUES (new.id, new.title, new.description, new.location,
+                (SELECT name FROM events_category WHERE id = new.category_id));
+    END
+    """,
+    "events_event_fts_delete": f"""
+    CREATE TRIGGER IF NOT EXISTS events_event_fts_delete AFTER DELETE ON events_event BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+    END
+    """,
+    "events_category_fts_rename": f"""
+    CREATE TRIGGER IF NOT EXISTS events_category_fts_rename AFTER UPDATE OF name ON events_category BEGIN
+        UPDATE {FTS_TABLE} SET category = new.name
+        WHERE rowid IN (SELECT id FROM events_event WHERE category_id = new.id);
+    END
+    """,
+}
+
+REBUILD_SQL = [
+    f"DELETE FROM {FTS_TABLE}",
+    f"""
+    INSERT INTO {FTS_TABLE} (rowid, title, description, location, category)
+    SELECT e.id, e.title, e.description, e.location, c.name
+    FROM events_event e JOIN events_category c ON c.id = e.category_id
+    """,
+    # Merge index segments left behind by many small trigger writes
+    f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')",
+]
+
+
+def search_terms(text):
+    """The words in user input. Punctuation and FTS5 syntax are dropped."""
+    return re.findall(r"\w+", text or "")
+
+
+def fts_query(text):
+    """
+    FTS5 MATCH expression for user input: every word must match, each as a
+    prefix so results update while typing. Every word is quoted, so input
+    like 'AND', 'NEAR(' or a stray quote can't break the query.
+    """
+    return " ".join(f'"{term}"*' for term in search_terms(text))
+
+
+def search_supported(using="default"):
+    return connections[using].vendor == "sqlite"
+
+
+def rebuild_search_index(using="default"):
+    """Repopulate the FTS table from events_event (and restore its triggers). Returns the number of rows indexed."""
+    create_search_triggers(using)
+    with transaction.atomic(using=using), connections[using].cursor() as cursor:
+        for sql in REBUILD_SQL:
+            cursor.execute(sql)
+        cursor.execute(f"SELECT COUNT(*) FROM {FTS_TABLE}")
+        return cursor.fetchone()[0]
+
+
+def search_index_exists(using="default"):
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return False
+    with connection.cursor() as cursor:
+        return FTS_TABLE in connection.introspection.table_names(cursor)
+
+
+def create_search_triggers(using="default"):
+    """(Re)create the triggers that keep the FTS table current. No-op without the table."""
+    if not search_index_exists(using):
+        return
+    with connections[using].cursor() as cursor:
+        for sql in TRIGGER_SQL.values():
+            cursor.execute(sql)
+
+
+def drop_search_triggers(using="default"):
+    """Drop the triggers, so schema changes can rebuild events_event and events_category."""
+    if not search_supported(using):
+        return
+    with connections[using].cursor() as cursor:
+        for name in TRIGGER_SQL:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
@@ -0,0 +1,95 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import RSVP, Event
+
+# RSVP admission, shared by the HTML views and the REST API.
+#
+# Why not get_or_create + a capacity check?
+# - Reading attendee_count, comparing it to capacity and then inserting
+#   leaves a window where two requests both see the last seat free.
+# - Here the check *is* the write: one UPDATE bumps attendee_count only
+#   WHERE the event still has room, and the database applies it to the
+#   row atomically. Zero rows updated means rejected. No locks are held
+#   beyond that statement's own row write, and nothing is retried.
+# - The RSVP insert and the seat UPDATE share a transaction, so a
+#   rejected or duplicate RSVP leaves no trace.
+#
+# Examples:
+#     rsvp, created = create_rsvp(request.user, event.pk)
+#     reserve_seats(event.pk, 25)     # Bulk API: 25 seats or none
+
+
+class RSVPRejected(Exception):
+    """The event can't take this RSVP. str(error) is a user-facing reason."""
+
+
+def _with_room(event_id, seats):
+    """The event, only while it is open and has ``seats`` free places."""
+    return (
+        Event.objects.filter(pk=event_id)
+        .exclude(status=Event.Status.CANCELLED)
+        .filter(Q(capacity__isnull=True) | Q(capacity__gte=F("attendee_count") + seats))
+    )
+
+
+def reserve_seats(event_id, seats=1):
+    """
+    Count ``seats`` new attendees if (and only if) they all fit.
+
+    UPDATE events_event SET attendee_count = attendee_count + seats
+    WHERE id = ... AND status != 'cancelled'
+      AND (capacity IS NULL OR capacity >= attendee_count + seats)
+
+    Returns True if the seats were taken.
+    """
+    updated = _with_room(event_id, seats).update(
+        attendee_count=F("attendee_count") + seats,
+        updated_at=timezone.now(),
+    )
+    return bool(updated)
+
+
+def rejection_reason(event_id):
+    """Why reserve_seats() said no. Only the failure path pays for this read."""
+    event = Event.objects.filter(pk=event_id).only("status", "capacity", "attendee_count").first()
+    if event is None:
+        return "This event no longer exists."
+    if event.status == Event.Status.CANCELLED:
+        return "Cannot RSVP to a cancelled event."
+    return "This event is full."
+
+
+def create_rsvp(user, event_id):
+    """
+    RSVP ``user`` to the event. Returns (rsvp, created) like get_or_create.
+
+    Raises RSVPRejected if the event is cancelled, full or gone.
+    """
+    try:
+        with transaction.atomic():
+            # Insert first: a duplicate fails on the unique (user, event)
+            # index before it can take a seat.
+            rsvp = RSVP(user=user, event_id=event_id)
+            rsvp._attendee_counted = True  # reserve_seats() counts it, not the signal
+            rsvp.save()
+            if not reserve_seats(event_id):
+                raise RSVPRejected(rejection_reason(event_id))
+    except IntegrityError:
+        existing = RSVP.objects.filter(user=user, event_id=event_id).first()
+        if existing is None:
+            raise  # Not a duplicate (e.g. unknown user)
+        return existing, False
+    return rsvp, True
+
+
+def move_rsvp(rsvp, event_id):
+    """Point an existing RSVP at another event, admitted like a new RSVP."""
+    with transaction.atomic():
+        if not reserve_seats(event_id):
+            raise RSVPRejected(rejection_reason(event_id))
+        rsvp.event_id = event_id
+        rsvp._attendee_counted = True  # The signal still releases the old seat
+        rsvp.save()
+    return rsvp
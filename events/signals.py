@@ -0,0 +1,105 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_migrate, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import bump_generation, bump_rsvp_generation
+from .categories import clear_categories
+from .models import RSVP, Category, Event
+from .search import create_search_triggers, drop_search_triggers, rebuild_search_index, search_index_exists
+
+
+def _adjust_attendee_count(event_id, delta):
+    """
+    Atomic counter update: UPDATE ... SET attendee_count = attendee_count + delta.
+
+    The arithmetic happens in the database, so two concurrent RSVPs can't
+    read the same old value and overwrite each other.
+    """
+    events = Event.objects.filter(pk=event_id)
+    if delta < 0:
+        # Never drive the counter negative, even if it already drifted
+        events = events.filter(attendee_count__gte=-delta)
+    # .update() skips auto_now, so touch updated_at explicitly: ETags and
+    # Last-Modified (api/mixins.py) treat an RSVP change as an event change.
+    events.update(attendee_count=F("attendee_count") + delta, updated_at=timezone.now())
+
+
+@receiver(pre_save, sender=RSVP)
+def remember_previous_event(sender, instance, raw, **kwargs):
+    """
+    An update that moves an RSVP to another event (API PUT/PATCH) must
+    move the count too. Only updates pay for this lookup, never inserts.
+    """
+    instance._previous_event_id = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    instance._previous_event_id = RSVP.objects.filter(pk=instance.pk).values_list("event_id", flat=True).first()
+
+
+@receiver(post_save, sender=RSVP)
+def count_rsvp_saved(sender, instance, created, raw, **kwargs):
+    if raw:
+        # loaddata: fixtures carry their own attendee_count values
+        return
+    # The RSVP service (events/services.py) counts the new seat itself, in
+    # the same UPDATE that checks capacity.
+    counted = getattr(instance, "_attendee_counted", False)
+    if created:
+        if not counted:
+            _adjust_attendee_count(instance.event_id, 1)
+        return
+    previous_event_id = getattr(instance, "_previous_event_id", None)
+    if previous_event_id is not None and previous_event_id != instance.event_id:
+        _adjust_attendee_count(previous_event_id, -1)
+        if not counted:
+            _adjust_attendee_count(instance.event_id, 1)
+
+
+@receiver(post_delete, sender=RSVP)
+def count_rsvp_deleted(sender, instance, **kwargs):
+    # Also fires for cascades (deleting a user deletes their RSVPs) and for
+    # queryset .delete(), because Django can't fast-delete rows that have
+    # a post_delete receiver.
+    _adjust_attendee_count(instance.event_id, -1)
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_event_lists(sender, **kwargs):
+    # Any change can move an event in or out of a cached list, so start a
+    # new cache generation.
+    bump_generation()
+
+
+@receiver(post_save, sender=RSVP)
+@receiver(post_delete, sender=RSVP)
+def invalidate_rsvp_lists(sender, **kwargs):
+    # An RSVP only moves events in attendee-sorted and my_rsvps lists
+    bump_rsvp_generation()
+
+
+# Category registry (events/categories.py): drop the in-memory copy on any change
+post_save.connect(clear_categories, sender=Category, dispatch_uid="events.clear_categories.save")
+post_delete.connect(clear_categories, sender=Category, dispatch_uid="events.clear_categories.delete")
+post_migrate.connect(clear_categories, dispatch_uid="events.clear_categories.migrate")
+
+
+# Full-text search triggers (events/search.py): off while migrations run,
+# so the schema editor can rebuild events_event and events_category
+
+
+@receiver(pre_migrate)
+def drop_search_triggers_before_migrate(sender, using, **kwargs):
+    if sender.label == "events":
+        drop_search_triggers(using)
+
+
+@receiver(post_migrate)
+def restore_search_triggers_after_migrate(sender, using, plan=None, **kwargs):
+    if sender.label != "events" or not search_index_exists(using):
+        return
+    create_search_triggers(using)
+    if plan:
+        # Migrations may have written events while the triggers were off
+        rebuild_search_index(using)
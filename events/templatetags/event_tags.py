@@ -1,14 +1,21 @@
 from django import template
 
+from events import categories
+from events.cache import render_event_cards
+
 register = template.Library()
 
+# Cursor params belong to one specific page. They must be dropped whenever
+# the filters or sort change, otherwise the new list starts mid-way through.
+PAGE_PARAMS = ("after", "before")
+
 
 @register.simple_tag(takes_context=True)
 def filter_query_string(context):
     """
     Build a query string containing only the current filter parameters,
-    excluding sort/dir. Used by sort buttons so they can append their
-    own sort params without losing active filters.
+    excluding sort/dir and pagination cursors. Used by sort buttons so they
+    can append their own sort params without losing active filters.
 
     Usage:
         {% filter_query_string as filter_qs %}
@@ -17,8 +24,54 @@ def filter_query_string(context):
     request = context["request"]
     params = request.GET.copy()
 
-    # Remove sort params — we only want filters
+    # Remove sort and page params — we only want filters
     params.pop("sort", None)
     params.pop("dir", None)
+    for name in PAGE_PARAMS:
+        params.pop(name, None)
+
+    return params.urlencode()
+
+
+@register.simple_tag(takes_context=True)
+def page_query_string(context, **cursor):
+    """
+    Build a query string for a Next/Previous link: the current filters
+    and sort, plus exactly one pagination cursor.
+
+    Usage:
+        <a href="?{% page_query_string after=page.next_cursor %}">Next</a>
+        <a href="?{% page_query_string before=page.previous_cursor %}">Previous</a>
+    """
+    request = context["request"]
+    params = request.GET.copy()
+
+    for name in PAGE_PARAMS:
+        params.pop(name, None)
+    for name, value in cursor.items():
+        if name in PAGE_PARAMS and value:
+            params[name] = value
 
     return params.urlencode()
+
+
+@register.simple_tag
+def event_cards(events):
+    """
+    Render the list page's event cards from per-event cached fragments.
+
+    Usage:
+        {% event_cards page %}
+    """
+    return render_event_cards(events)
+
+
+@register.filter
+def category_name(category_id):
+    """
+    Category name from the in-memory registry — no join, no query.
+
+    Usage:
+        {{ event.category_id|category_name }}
+    """
+    return categories.category_name(category_id)
@@ -8,9 +8,11 @@ app_name = "events"
 urlpatterns = [
     path("", views.event_list, name="event_list"),
     path("create/", views.event_create, name="event_create"),
+    path("export/<str:fmt>/", views.event_export, name="event_export"),
     path("<int:pk>/", views.event_detail, name="event_detail"),
     path("<int:pk>/edit/", views.event_edit, name="event_edit"),
     path("<int:pk>/cancel/", views.event_cancel, name="event_cancel"),
     path("<int:pk>/rsvp/", views.event_rsvp, name="event_rsvp"),
     path("<int:pk>/rsvp/cancel/", views.event_rsvp_cancel, name="event_rsvp_cancel"),
+    path("<int:pk>/attendees/<str:fmt>/", views.event_attendees_export, name="event_attendees_export"),
 ]
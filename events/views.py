@@ -1,13 +1,16 @@
-from decimal import Decimal, InvalidOperation  # noqa
+from asgiref.sync import sync_to_async
 from django.contrib.auth.decorators import login_required
-from django.db.models import Count  # noqa
 from django.http import HttpResponseForbidden
-from django.shortcuts import get_object_or_404, redirect, render
+from django.shortcuts import aget_object_or_404, get_object_or_404, redirect, render
 from django.views.decorators.http import require_POST
 
-
+from .cache import CachedKeysetPaginator, acached_event_ids, arender_event_cards
+from .categories import aall_categories
+from .export import ATTENDEE_COLUMNS, EVENT_COLUMNS, export_response
+from .filters import EventFilter
 from .forms import EventForm
-from .models import RSVP, Event, Category  # noqa
+from .models import RSVP, Category, Event  # noqa
+from .services import RSVPRejected, create_rsvp
 
 
 @login_required
@@ -25,19 +28,40 @@ def event_create(request):
     return render(request, "events/event_create.html", {"form": form})
 
 
-def event_detail(request, pk):
-    event = get_object_or_404(Event, pk=pk)
-    is_creator = request.user == event.creator
+# The list, detail and RSVP views are async: under ASGI they wait on the
+# database without holding a worker thread. They load everything the
+# template needs before render(), which must not touch the database.
+
+
+async def resolve_user(request):
+    """
+    The current user, loaded with the async ORM.
+
+    Also replaces the lazy request.user, whose first use would query the
+    database synchronously (templates and context processors read it).
+    """
+    request.user = await request.auser()
+    return request.user
+
+
+async def event_detail(request, pk):
+    user = await resolve_user(request)
+
+    # One query for the event, creator, count and RSVP state
+    event = await aget_object_or_404(Event.objects.for_detail(user), pk=pk)
+
+    # Compare ids: no need to load the creator to know who it is
+    is_creator = user.is_authenticated and event.creator_id == user.pk
 
-    attendee_count = event.rsvps.count()
+    attendee_count = event.attendee_count
 
     attendee_list = None
     if is_creator:
-        attendee_list = event.rsvps.select_related("user").all()
+        attendee_list = [rsvp async for rsvp in event.rsvps.select_related("user")]
 
-    has_rsvped = False
-    if request.user.is_authenticated:
-        has_rsvped = event.rsvps.filter(user=request.user).exists()
+    await aall_categories()  # The template reads the category name from the registry
+
+    has_rsvped = event.has_rsvped
 
     return render(
         request,
@@ -89,111 +113,93 @@ def event_cancel(request, pk):
 
 @login_required
 @require_POST
-def event_rsvp(request, pk):
-    event = get_object_or_404(Event, pk=pk)
-
-    if event.status == Event.Status.CANCELLED:
-        return HttpResponseForbidden("Cannot RSVP to a cancelled event.")
-
-    RSVP.objects.get_or_create(user=request.user, event=event)
+async def event_rsvp(request, pk):
+    user = await resolve_user(request)
+    event = await aget_object_or_404(Event.objects.only("pk"), pk=pk)
+
+    # Capacity and status are checked by the same UPDATE that takes the seat.
+    # create_rsvp() needs transaction.atomic(), which has no async form, so
+    # it runs on the thread that owns the database connection.
+    try:
+        await sync_to_async(create_rsvp)(user, event.pk)
+    except RSVPRejected as error:
+        return HttpResponseForbidden(str(error))
     return redirect("events:event_detail", pk=event.pk)
 
 
 @login_required
 @require_POST
-def event_rsvp_cancel(request, pk):
-    event = get_object_or_404(Event, pk=pk)
-    RSVP.objects.filter(user=request.user, event=event).delete()
+async def event_rsvp_cancel(request, pk):
+    user = await resolve_user(request)
+    event = await aget_object_or_404(Event.objects.only("pk"), pk=pk)
+    await RSVP.objects.filter(user=user, event=event).adelete()
     return redirect("events:event_detail", pk=event.pk)
 
 
-def event_list(request):
-    events = Event.objects.select_related("category", "creator")
-
-    # --- Filters ---
-
-    category_id = request.GET.get("category")
-    if category_id:
-        events = events.filter(category_id=category_id)
+async def event_list(request):
+    user = await resolve_user(request)
 
-    date_from = request.GET.get("date_from")
-    if date_from:
-        events = events.filter(date_time__date__gte=date_from)
+    # Category names come from the in-memory registry, so only join creator
+    events = Event.objects.select_related("creator")
 
-    date_to = request.GET.get("date_to")
-    if date_to:
-        events = events.filter(date_time__date__lte=date_to)
+    # --- Filters + sorting ---
 
-    price_max = request.GET.get("price_max")
-    if price_max:
-        try:
-            events = events.filter(price__lte=Decimal(price_max))
-        except InvalidOperation:
-            pass  # Ignore invalid decimal input
+    # One validated spec shared with the API (see events/filters.py).
+    # Invalid values are ignored rather than sent to the database.
+    spec = EventFilter(request.GET, user)
+    events = spec.filter(events)
 
-    free_only = request.GET.get("free_only")
-    if free_only:
-        events = events.filter(price=Decimal("0.00"))
+    # attendee_count is a stored column (see Event.attendee_count), so
+    # displaying and sorting by it needs no GROUP BY over RSVPs.
 
-    # Auth-required filters: silently skip if not logged in
-    if request.user.is_authenticated:
-        my_events = request.GET.get("my_events")
-        if my_events:
-            events = events.filter(creator=request.user)
+    # --- Pagination ---
 
-        my_rsvps = request.GET.get("my_rsvps")
-        if my_rsvps:
-            events = events.filter(rsvps__user=request.user)
-
-    # --- Sorting ---
-
-    # Always annotate attendee count so we can display it and sort by it
-    events = events.annotate(attendee_count=Count("rsvps"))
-
-    sort_field = request.GET.get("sort", "")
-    sort_dir = request.GET.get("dir", "asc")
-
-    sort_map = {
-        "date": "date_time",
-        "price": "price",
-        "location": "location",
-        "attendees": "attendee_count",
-    }
-
-    if sort_field in sort_map:
-        order_field = sort_map[sort_field]
-        if sort_dir == "desc":
-            order_field = f"-{order_field}"
-        events = events.order_by(order_field)
-    # else: default ordering from Meta (date_time ascending)
+    # Keyset pagination: cursors seek past the last row shown instead of
+    # using OFFSET, so deep pages cost the same as the first one. The
+    # ordered ids for this filter/sort combination are cached (see
+    # events/cache.py), so repeat visits only load the rows on the page.
+    paginator = CachedKeysetPaginator(
+        events,
+        field=spec.order_field,
+        descending=spec.descending,
+        cached=await acached_event_ids(spec, events),
+    )
+    page = await paginator.apage(after=request.GET.get("after"), before=request.GET.get("before"))
 
     # --- Template context ---
 
-    categories = Category.objects.all()
-
-    # Preserve current filter/sort values for form repopulation and sort toggle
-    current_filters = {
-        "category": category_id or "",
-        "date_from": date_from or "",
-        "date_to": date_to or "",
-        "price_max": price_max or "",
-        "free_only": free_only or "",
-        "my_events": request.GET.get("my_events", ""),
-        "my_rsvps": request.GET.get("my_rsvps", ""),
-    }
-
-    current_sort = {
-        "field": sort_field,
-        "dir": sort_dir if sort_field else "",
-    }
+    # Also warms the registry the event cards read category names from
+    categories = await aall_categories()
 
     return render(
         request,
         "events/event_list.html",
         {
-            "events": events,
+            "events": page,
+            "page": page,
+            # Rendered here, not by the event_cards tag: render() can't await the cache
+            "event_cards": await arender_event_cards(page),
             "categories": categories,
-            "current_filters": current_filters,
-            "current_sort": current_sort,
+            # Preserve current filter/sort values for form repopulation and sort toggle
+            "current_filters": spec.current_filters,
+            "current_sort": spec.current_sort,
         },
     )
+
+
+def event_export(request, fmt):
+    # Same filters and order as the list page, streamed instead of paginated
+    spec = EventFilter(request.GET, request.user)
+    events = spec.filter(Event.objects.all()).order_by(*spec.ordering)
+    return export_response(request, fmt, EVENT_COLUMNS, events, "events")
+
+
+@login_required
+def event_attendees_export(request, pk, fmt):
+    event = get_object_or_404(Event, pk=pk)
+
+    if request.user.pk != event.creator_id:
+        return HttpResponseForbidden("You can only export attendees of your own events.")
+
+    rsvps = event.rsvps.order_by("created_at", "pk")
+    return export_response(request, fmt, ATTENDEE_COLUMNS, rsvps, f"event-{event.pk}-attendees")